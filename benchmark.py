@@ -0,0 +1,316 @@
+""" headless benchmarks for the hot paths of the widget library.
+
+    python benchmark.py [--output results.json] [--repeat 5] [--quick]
+    python benchmark.py --check-imports
+
+    Every benchmark runs in Textual's headless test mode and reports its timings as JSON,
+    so the results of two runs can be compared (e.g. with `--compare old.json`).
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable
+
+import textual
+from textual.app import App, ComposeResult
+from textual.screen import Screen
+
+from textual_common import (ButtonBar, ButtonDef, DialogMessage, DialogQueueScreen, DialogScreen, FieldDef, Form, LabeledInput, 
+                            TerminalScreen, TerminalWrite, UpdownWidget, console_print, console_progress, console_run, get_console, init_console, message_box, show_console, 
+                            verify, verify_all)
+
+SIZE = (120, 50)
+
+def summary(samples: list[float])->dict:
+    samples = sorted(samples)
+    return {'n': len(samples),
+            'min': samples[0],
+            'median': statistics.median(samples),
+            'mean': statistics.mean(samples),
+            'p95': samples[min(len(samples)-1, round(0.95 * (len(samples)-1)))],
+            'max': samples[-1]}
+
+class BenchApp(App):
+    def __init__(self):
+        self.dialog_result = asyncio.Event()
+        super().__init__()
+    async def on_mount(self):
+        await init_console(self)
+    def on_dialog_message(self, message: DialogMessage):
+        self.dialog_result.set()
+
+async def wait_until(pilot, condition: Callable[[], bool], timeout = 60.0):
+    limit = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > limit:
+            raise TimeoutError('benchmark condition not reached')
+        await pilot.pause(0.001)
+
+def _print_lines(cancel_token, N: int, **kwdargs)->bool:
+    for i in range(N):
+        console_print(f'line {i}')
+    return True
+
+def _report_progress(cancel_token, N: int, **kwdargs)->bool:
+    for i in range(N):
+        console_progress('bench', i / N, f'{i} of {N}')
+    console_progress('bench', 1.0)
+    return True
+
+def last_line(screen: TerminalScreen)->str:
+    return screen.scrollback[-1] if len(screen.scrollback) else ''
+
+async def bench_console_throughput(pilot, n_lines: int, repeat: int)->dict:
+    """ lines per second from console_print in a script to the terminal """
+    samples = []
+    screen: TerminalScreen = get_console()._terminal
+    for _ in range(repeat):
+        await show_console()
+        await pilot.pause()
+        start = time.perf_counter()
+        await console_run(_print_lines, N=n_lines)
+        await wait_until(pilot, lambda: last_line(screen).startswith('READY'))
+        samples.append(n_lines / (time.perf_counter() - start))
+        screen.close()
+        await pilot.pause()
+    return {'unit': 'lines/s', 'lines': n_lines, **summary(samples)}
+
+async def bench_terminal_latency(pilot, repeat: int)->dict:
+    """ time from posting a TerminalWrite to the line being rendered """
+    samples = []
+    screen: TerminalScreen = get_console()._terminal
+    await show_console()
+    await pilot.pause()
+    for n in range(repeat):
+        line = f'latency {n}'
+        start = time.perf_counter()
+        screen.post_message(TerminalWrite(line))
+        await wait_until(pilot, lambda: last_line(screen) == line)
+        await pilot.pause()
+        samples.append(time.perf_counter() - start)
+    screen.close()
+    await pilot.pause()
+    return {'unit': 's', **summary(samples)}
+
+async def bench_progress(pilot, n_updates: int, repeat: int)->dict:
+    """ progress updates per second from console_progress in a script, and the lines they leave in the scrollback """
+    samples = []
+    screen: TerminalScreen = get_console()._terminal
+    for _ in range(repeat):
+        await show_console()
+        await pilot.pause()
+        start = time.perf_counter()
+        await (await console_run(_report_progress, N=n_updates)).wait()
+        samples.append(n_updates / (time.perf_counter() - start))
+        await wait_until(pilot, lambda: last_line(screen).startswith('READY'))
+        lines = len(screen.scrollback)
+        screen.close()
+        await pilot.pause()
+    return {'unit': 'updates/s', 'updates': n_updates, 'scrollback_lines': lines, **summary(samples)}
+
+async def bench_dialogs(pilot, repeat: int)->dict:
+    """ time to open verify/message_box and dismiss it with a button """
+    results = {}
+    app: BenchApp = pilot.app
+    for name, open_dialog, button in [('verify', lambda app: verify(app, 'Benchmark question?'), 'Ja'),
+                                      ('message_box', lambda app: message_box(app, 'Benchmark message'), 'OK')]:
+        open_samples, dismiss_samples = [], []
+        for _ in range(repeat):
+            app.dialog_result.clear()
+            start = time.perf_counter()
+            open_dialog(app)
+            await wait_until(pilot, lambda: isinstance(app.screen, DialogScreen))
+            await pilot.pause()
+            opened = time.perf_counter()
+            open_samples.append(opened - start)
+            button_widget = next(widget for widget in app.screen.query('Button') if str(widget.label) == button)
+            button_widget.press()
+            await asyncio.wait_for(app.dialog_result.wait(), 10)
+            dismiss_samples.append(time.perf_counter() - opened)
+        results[name] = {'unit': 's', 'open': summary(open_samples), 'dismiss': summary(dismiss_samples)}
+    return results
+
+async def bench_dialog_queue(pilot, n_questions: int, repeat: int)->dict:
+    """ time per question to answer `n_questions` questions with verify_all """
+    samples = []
+    app: BenchApp = pilot.app
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = verify_all(app, [f'Question {n}?' for n in range(n_questions)])
+        await wait_until(pilot, lambda: isinstance(app.screen, DialogQueueScreen))
+        await pilot.pause()
+        buttons = list(app.screen.query('Button'))
+        for n in range(n_questions):
+            buttons[n % 2].press()
+            await pilot.pause()
+        await asyncio.wait_for(results, 10)
+        samples.append((time.perf_counter() - start) / n_questions)
+    return {'unit': 's', 'questions': n_questions, **summary(samples)}
+
+class MountScreen(Screen):
+    def __init__(self, factory: Callable[[int], object], count: int):
+        self._factory = factory
+        self._count = count
+        super().__init__()
+    def compose(self)->ComposeResult:
+        for n in range(self._count):
+            yield self._factory(n)
+
+WIDGETS = {'LabeledInput': lambda n: LabeledInput(f'Field {n}', horizontal=n % 2 == 0, id=f'field{n}'),
+           'UpdownWidget': lambda n: UpdownWidget(name=f'updown{n}'),
+           'ButtonBar': lambda n: ButtonBar([ButtonDef('OK', variant='primary', id=f'ok{n}'), ButtonDef('Cancel', variant='error', id=f'cancel{n}')]),
+           }
+async def bench_mount(count: int, repeat: int)->dict:
+    """ time to mount and lay out a screen with `count` widgets of one kind """
+    results = {}
+    for name, factory in WIDGETS.items():
+        samples = []
+        app = App()
+        async with app.run_test(size=SIZE) as pilot:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await app.push_screen(MountScreen(factory, count))
+                await pilot.pause()
+                samples.append(time.perf_counter() - start)
+                await app.pop_screen()
+                await pilot.pause()
+        results[name] = {'unit': 's', 'widgets': count, **summary(samples)}
+    return results
+
+async def bench_form(count: int, repeat: int)->dict:
+    """ time to mount a Form with `count` fields, and to read and write all values """
+    mount_samples, get_samples, set_samples = [], [], []
+    app = App()
+    async with app.run_test(size=SIZE) as pilot:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await app.push_screen(MountScreen(lambda n: Form([FieldDef(f'field{n}', f'Field {n}', horizontal=n % 2 == 0) for n in range(count)]), 1))
+            await pilot.pause()
+            mount_samples.append(time.perf_counter() - start)
+            form = app.screen.query_one(Form)
+            start = time.perf_counter()
+            values = form.get_values()
+            get_samples.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            form.set_values({id: 'value' for id in values})
+            set_samples.append(time.perf_counter() - start)
+            await app.pop_screen()
+            await pilot.pause()
+    return {'unit': 's', 'fields': count, 'mount': summary(mount_samples), 'get_values': summary(get_samples), 'set_values': summary(set_samples)}
+
+def toolbar(n: int)->list[ButtonDef]:
+    return [ButtonDef('Save', variant='primary', id='save', disabled=n % 2 == 0), ButtonDef(f'Step {n % 3}', id='step'), 
+            *([ButtonDef('Extra', id='extra')] if n % 4 == 0 else []), ButtonDef('Close', id='close')]
+async def bench_button_bar_update(repeat: int)->dict:
+    """ time to change the buttons of a ButtonBar: with set_buttons, and by replacing the ButtonBar """
+    set_samples, replace_samples = [], []
+    app = App()
+    async with app.run_test(size=SIZE) as pilot:
+        bar = ButtonBar(toolbar(0))
+        await app.screen.mount(bar)
+        for n in range(repeat):
+            start = time.perf_counter()
+            await bar.set_buttons(toolbar(n + 1))
+            await pilot.pause()
+            set_samples.append(time.perf_counter() - start)
+        for n in range(repeat):
+            start = time.perf_counter()
+            await bar.remove()
+            bar = ButtonBar(toolbar(n + 1))
+            await app.screen.mount(bar)
+            await pilot.pause()
+            replace_samples.append(time.perf_counter() - start)
+    return {'unit': 's', 'set_buttons': summary(set_samples), 'replace': summary(replace_samples)}
+
+# cold import of a name from the package, in seconds on top of importing textual.app itself
+IMPORT_BUDGET = {'textual_common': 0.01,
+                 'ButtonBar': 0.05,
+                 'verify': 0.05,
+                 'LabeledInput': 0.08,
+                 'UpdownWidget': 0.05,
+                 'Form': 0.08,
+                 'Console': 0.15,
+                 }
+_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+print(json.dumps({{'time': time.perf_counter() - start, 'modules': sorted(name for name in sys.modules if name.startswith('textual_common.'))}}))
+"""
+def import_time(statement: str)->dict:
+    """ time of `statement` in a new interpreter, and the modules of the package it loaded """
+    output = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT.format(statement=statement)], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+def bench_import_time(repeat: int)->dict:
+    """ cold import times of the names in IMPORT_BUDGET, and their overhead on top of importing textual.app """
+    baseline = statistics.median(import_time('import textual.app')['time'] for _ in range(repeat))
+    results = {'unit': 's', 'textual.app': baseline}
+    for name, budget in IMPORT_BUDGET.items():
+        statement = f'import {name}' if name == 'textual_common' else f'import textual.app; from textual_common import {name}'
+        samples = [import_time(statement) for _ in range(repeat)]
+        median = statistics.median(sample['time'] for sample in samples)
+        results[name] = {**summary([sample['time'] for sample in samples]), 'overhead': median - (0 if name == 'textual_common' else baseline), 
+                         'budget': budget, 'modules': samples[0]['modules']}
+    return results
+def check_import_budget(results: dict)->bool:
+    ok = True
+    for name, budget in IMPORT_BUDGET.items():
+        overhead = results[name]['overhead']
+        print(f'{name:20} {overhead*1000:8.1f} ms  (budget {budget*1000:6.1f} ms) {"" if overhead <= budget else "OVER BUDGET"}  {" ".join(results[name]["modules"])}')
+        ok = ok and overhead <= budget
+    return ok
+
+async def run_benchmarks(repeat: int, quick: bool)->dict:
+    scale = 10 if quick else 1
+    results = {'import_time': bench_import_time(repeat)}
+    # the console benchmarks share one app and its default console
+    async with BenchApp().run_test(size=SIZE) as pilot:
+        results['console_throughput'] = await bench_console_throughput(pilot, 100000 // scale, repeat)
+        results['terminal_latency'] = await bench_terminal_latency(pilot, repeat * 10)
+        results['progress'] = await bench_progress(pilot, 1000000 // scale, repeat)
+        results['dialogs'] = await bench_dialogs(pilot, repeat * 4)
+        results['dialog_queue'] = await bench_dialog_queue(pilot, 100 // scale, repeat)
+    results['mount'] = await bench_mount(500 // scale, repeat)
+    results['form'] = await bench_form(500 // scale, repeat)
+    results['button_bar_update'] = await bench_button_bar_update(repeat * 10)
+    return results
+
+def compare(old: dict, new: dict, path=''):
+    for key, value in new.items():
+        if isinstance(value, dict):
+            compare(old.get(key, {}), value, f'{path}{key}.')
+        elif key == 'median' and key in old:
+            change = (value - old[key]) / old[key] * 100 if old[key] else 0.0
+            print(f'{path + key:40} {old[key]:14.6f} -> {value:14.6f}  {change:+7.1f}%')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='headless benchmarks for textual-common')
+    parser.add_argument('--output', help='write the results as JSON to this file (default: stdout)')
+    parser.add_argument('--repeat', type=int, default=5, help='number of repetitions per benchmark')
+    parser.add_argument('--quick', action='store_true', help='smaller workloads, for a quick check')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare with')
+    parser.add_argument('--check-imports', action='store_true', help='only check the import times against IMPORT_BUDGET (exit code 1 if over budget)')
+    args = parser.parse_args()
+    if args.check_imports:
+        sys.exit(0 if check_import_budget(bench_import_time(args.repeat)) else 1)
+    results = {'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+               'python': platform.python_version(),
+               'textual': textual.__version__,
+               'platform': platform.platform(),
+               'benchmarks': asyncio.run(run_benchmarks(args.repeat, args.quick)),
+               }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file)['benchmarks'], results['benchmarks'])
@@ -0,0 +1,33 @@
+""" common widgets and dialogs for Textual apps.
+
+    The names below are loaded on first use (PEP 562), so `from textual_common import verify` only imports
+    the dialogs module and what it needs, not the terminal.
+"""
+from importlib import import_module
+
+_LAZY = {'ButtonBar': 'button_bar', 'ButtonDef': 'button_bar',
+         'DialogMessage': 'dialogs', 'DialogQueueMessage': 'dialogs', 'DialogScreen': 'dialogs', 'DialogQueueScreen': 'dialogs',
+         'message_box': 'dialogs', 'verify': 'dialogs', 'verify_all': 'dialogs', 'verify_cancel': 'dialogs',
+         'FileDialog': 'file_dialog', 'ask_filename': 'file_dialog', 'ask_open_filename': 'file_dialog', 'ask_save_filename': 'file_dialog',
+         'scan_directory': 'file_dialog',
+         'FieldDef': 'form', 'Form': 'form',
+         'LabeledInput': 'labeled_input', 'InputWithButton': 'labeled_input',
+         'Required': 'required',
+         'Singleton': 'singleton',
+         'CancelToken': 'terminal', 'Console': 'terminal', 'ConsoleHandler': 'terminal', 'TerminalScreen': 'terminal', 'TerminalWrite': 'terminal',
+         'console_error': 'terminal', 'console_print': 'terminal', 'console_progress': 'terminal', 'console_run': 'terminal', 'console_run_command': 'terminal',
+         'console_warning': 'terminal', 'get_console': 'terminal', 'init_console': 'terminal', 'show_console': 'terminal', 'TerminalChannel': 'terminal',
+         'UpdownWidget': 'up_down',
+         'AsyncValidator': 'validation', 'PathExists': 'validation', 'Validation': 'validation', 'ValidatedInput': 'validation',
+         'validate_value': 'validation', 'validated_input': 'validation',
+         }
+__all__ = list(_LAZY)
+
+def __getattr__(name: str):
+    if (module := _LAZY.get(name)) is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+def __dir__()->list[str]:
+    return sorted(set(globals()) | set(_LAZY))
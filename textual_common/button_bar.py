@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Iterable
+from textual.containers import Horizontal, Vertical
+from textual.app import ComposeResult
+from textual.await_complete import AwaitComplete
+from textual.widgets import Button, Log, Static
+
+@dataclass
+class ButtonDef:
+    label: str = None
+    variant: str = 'default'
+    name: str = None
+    id: str = None
+    classes: str = None
+    disabled: bool = False
+
+class ButtonBar(Static):
+    DEFAULT_CSS = """   
+        ButtonBar{
+            align: center middle;
+        }
+        ButtonBar.horizontal {
+            layout: horizontal;
+        }
+        ButtonBar.vertical {
+            layout: vertical;
+        }
+    	ButtonBar.horizontal Button {
+            margin: 0 1 0 1;
+        }
+    	ButtonBar.vertical Button {
+            margin: 1 0 1 0;
+        }
+    """
+    
+    def __init__(self, buttons: Iterable[ButtonDef], horizontal=True, **kwdargs):
+        self._buttons = list(buttons)
+        self._widgets: dict[str, Button] = {}
+        super().__init__(classes = 'horizontal' if horizontal else 'vertical', **kwdargs)
+    @staticmethod
+    def _key(button: ButtonDef)->str:
+        return button.id or str(button.label)
+    @staticmethod
+    def _make_button(button: ButtonDef)->Button:
+        return Button(label=button.label, variant=button.variant, name=button.name, id=button.id, classes=button.classes, disabled=button.disabled)
+    def compose(self)->ComposeResult:
+        for button in self._buttons:
+            self._widgets[self._key(button)] = self._make_button(button)
+            yield self._widgets[self._key(button)]
+    def set_buttons(self, buttons: Iterable[ButtonDef])->AwaitComplete:
+        """ changes the buttons without recomposing: buttons are matched by id (or label, if they have no id). 
+            Matching buttons are updated in place, only new buttons are mounted and buttons that are gone are removed, 
+            all in one batch update. The result can be awaited to wait for the mounts and removals. 
+        """
+        buttons = list(buttons)
+        old_buttons = {self._key(button): button for button in self._buttons}
+        new_keys = {self._key(button) for button in buttons}
+        awaitables = []
+        with self.app.batch_update():
+            for key in [key for key in self._widgets if key not in new_keys]:
+                awaitables.append(self._widgets.pop(key).remove())
+            previous: Button = None
+            for button in buttons:
+                key = self._key(button)
+                if (widget := self._widgets.get(key)) is None:
+                    widget = self._widgets[key] = self._make_button(button)
+                    awaitables.append(self.mount(widget, after=previous) if previous else self.mount(widget, before=0))
+                else:
+                    self.__update_button(widget, old_buttons[key], button)
+                    position = self.children.index(widget)
+                    if position != (self.children.index(previous) + 1 if previous else 0):
+                        self.move_child(widget, after=previous) if previous else self.move_child(widget, before=0)
+                previous = widget
+        self._buttons = buttons
+        return AwaitComplete(*awaitables)
+    @staticmethod
+    def __update_button(widget: Button, old: ButtonDef, new: ButtonDef):
+        widget.label = new.label
+        widget.variant = new.variant
+        widget.disabled = new.disabled
+        if new.classes != old.classes:
+            widget.remove_class(*(old.classes or '').split())
+            widget.add_class(*(new.classes or '').split())
+
+
+if __name__== '__main__':
+    from textual.widgets import Header, Footer
+    from textual.app import App
+
+    import logging
+    logging.basicConfig(filename='verify.log', filemode='w', format='%(module)s-%(funcName)s-%(lineno)d: %(message)s', level=logging.DEBUG)
+    class TestApp(App):
+        # BINDINGS = [("v", "verify", "Verify")]
+        DEFAULT_CSS = """
+        ButtonBar.horizontal {
+            outline: round purple;
+            background: lightgray;
+            min-width: 100;
+            height: 5;
+        }
+        ButtonBar.vertical {
+            outline: round green;
+            background: rgb(224,33,138);
+            width: 30;
+        }
+        """
+        def compose(self) -> ComposeResult:
+            yield Header()
+            yield ButtonBar([ButtonDef('hallo', variant='primary'), ButtonDef('goodbye', variant='error'), ButtonDef('zwaai', variant='success')])
+            yield ButtonBar([ButtonDef('hallo', variant='primary'), ButtonDef('goodbye', variant='error'), ButtonDef('zwaai', variant='success')], horizontal=False)
+            yield Footer()
+    
+    app = TestApp()
+    app.run()    
\ No newline at end of file
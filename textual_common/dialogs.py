@@ -0,0 +1,246 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Iterable
+
+from textual.app import App, ComposeResult
+from textual.message_pump import MessagePump
+from textual.containers import Center
+from textual.screen import ModalScreen
+from textual.widgets import Button, Label, Static
+from textual.message import Message
+
+from .button_bar import ButtonBar, ButtonDef
+            
+@lru_cache(maxsize=1024)
+def get_split_width(s: str)->int:
+    return max(len(substr) for substr in s.split('\n'))
+
+@lru_cache(maxsize=256)
+def button_widths(labels: tuple[str, ...])->tuple[int, int]:
+    """ (width of every button, total width of the buttons) for a row of buttons with these labels """
+    button_width = max(12, max(len(label) for label in labels)) + 6
+    return button_width, len(labels) * (button_width + 2) + 4
+
+class DialogMessage(Message):
+    def __init__(self, result_str: str, originator_key: str):
+        self.result_str = result_str
+        self.originator_key = originator_key
+        super().__init__()
+
+class DialogQueueMessage(Message):
+    """ the answers to all questions of a verify_all, in the order of the questions """
+    def __init__(self, results: list[str], originator_key: str):
+        self.results = results
+        self.originator_key = originator_key
+        super().__init__()
+
+class DialogForm(Static):
+    DEFAULT_CSS = """   
+        DialogForm {
+            align: center middle;
+            height: 11;
+            border: thick $surface 50%;
+            background: wheat;
+        }
+        DialogForm Label{
+            column-span: 2;
+            height: 1fr;
+            width: 1fr;
+            content-align: center middle;
+            color: black;
+        }
+    """    
+    def __init__(self, label_str: str, buttons: Iterable[ButtonDef]): 
+        self._label_str = label_str
+        self._buttons = list(buttons)
+        self._button_width, self._total_button_width = button_widths(tuple(str(button.label) for button in self._buttons))
+        super().__init__()
+    def compose(self) -> ComposeResult:
+        with Center():
+            yield Label(self._label_str)
+            yield ButtonBar(self._buttons)
+    def on_mount(self):
+        for button in self.query(Button):
+            button.styles.width = self._button_width
+        self.__set_width()
+    def set_label(self, label_str: str):
+        if label_str != self._label_str:
+            self._label_str = label_str
+            self.query_one(Label).update(label_str)
+            self.__set_width()
+    def __set_width(self):
+        w = 2 + max(self._total_button_width, self.__label_width())
+        logging.debug(f'label: {self.__label_width()} button: {self._button_width} totalbuttons: {self._total_button_width} -> {w=}')
+        self.styles.min_width = w
+        self.styles.width = w
+    def __label_width(self)->int:
+        return get_split_width(self._label_str) + 4
+
+class DialogScreen(ModalScreen[str]):
+    DEFAULT_CSS = """   
+        DialogScreen {
+            align: center middle;
+            background: wheat 50%;
+        }
+        DialogScreen DialogForm{
+            align: center middle;
+            max-width: 120;
+            height: 11;
+            border: thick $surface 50%;
+        }
+    """
+    def __init__(self, label_str: str, buttons: Iterable[ButtonDef], originator_key: str):
+        self._label_str = label_str
+        self._buttons = buttons
+        self.originator_key = originator_key
+        self.dialog_result  = None
+        super().__init__()
+    def compose(self) -> ComposeResult:
+        yield DialogForm(self._label_str, self._buttons)
+    def reuse(self, label_str: str, originator_key: str):
+        """ prepares an installed dialog for another run with a new text """
+        self._label_str = label_str
+        self.originator_key = originator_key
+        if self.is_mounted:
+            self.query_one(DialogForm).set_label(label_str)
+            self.set_focus(None) # the first button gets the focus again, as in a new dialog
+            # the button that closed the previous dialog may still show as pressed, and a Button ignores clicks while it does
+            for button in self.query(Button):
+                button.remove_class('-active')
+    def run(self, originator: MessagePump)->str:
+        def __callback_verify(result: str):
+            originator.post_message(DialogMessage(result, self.originator_key))
+        self.dialog_result  = None
+        self.app.push_screen(self, callback = __callback_verify)                
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        self.dismiss(event.button.label)
+        event.stop()
+
+class DialogQueueScreen(ModalScreen[list[str]]):
+    """ asks a series of questions in one modal screen: only the text changes between questions. 
+        The last two buttons answer the current and all remaining questions with the first or the second button.
+    """
+    DEFAULT_CSS = DialogScreen.DEFAULT_CSS.replace('DialogScreen', 'DialogQueueScreen')
+    def __init__(self, questions: Iterable[str], buttons: Iterable[ButtonDef], originator_key: str):
+        self._questions = list(questions)
+        self._buttons = list(buttons)
+        self.originator_key = originator_key
+        self.results: list[str] = []
+        super().__init__()
+    def compose(self) -> ComposeResult:
+        yield DialogForm(self._questions[0] if self._questions else '', self._buttons)
+    def on_mount(self):
+        self.__show_question()
+    def __show_question(self):
+        form = self.query_one(DialogForm)
+        form.border_title = f'{len(self.results)+1}/{len(self._questions)}'
+        form.set_label(self._questions[len(self.results)])
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        event.stop()
+        index = list(self.query(Button)).index(event.button)
+        answer = str(self._buttons[index % 2].label)
+        if index < 2:
+            self.results.append(answer)
+        else:
+            self.results.extend([answer] * (len(self._questions) - len(self.results)))
+        if len(self.results) < len(self._questions):
+            self.__show_question()
+        else:
+            self.dismiss(self.results)
+
+def _layout_key(buttons: Iterable[ButtonDef])->str:
+    return 'dialog:' + '|'.join(f'{button.label}/{button.variant}/{button.id}' for button in buttons)
+def dialog_screen(app: App, label_str: str, buttons: Iterable[ButtonDef], originator_key: str)->DialogScreen:
+    """ a DialogScreen from the pool of installed dialogs with the same buttons, 
+        or a new one if that dialog is already showing (nested dialogs)
+    """
+    buttons = list(buttons)
+    name = _layout_key(buttons)
+    if not app.is_screen_installed(name):
+        screen = DialogScreen(label_str, buttons, originator_key)
+        app.install_screen(screen, name)
+        return screen
+    screen = app.get_screen(name)
+    if screen in app.screen_stack:
+        return DialogScreen(label_str, buttons, originator_key)
+    screen.reuse(label_str, originator_key)
+    return screen
+
+def run_dialog(originator: MessagePump, screen: DialogScreen)->str:
+    return screen.run(originator)
+
+def message_box(originator: MessagePump, message: str, originator_key='message'):
+    run_dialog(originator, dialog_screen(originator.app, message, [ButtonDef('OK', variant='primary')], originator_key=originator_key))
+               
+def verify(originator: MessagePump, question: str, originator_key='verify', buttons=['Ja', 'Nee'])->str:
+    return run_dialog(originator, dialog_screen(originator.app, question, [ButtonDef(buttons[0], variant='success'), ButtonDef(buttons[1], variant='error')], originator_key=originator_key))
+def verify_all(originator: MessagePump, questions: Iterable[str], originator_key='verify_all', 
+               buttons=['Ja', 'Nee', 'Ja voor alles', 'Nee voor alles'])->asyncio.Future[list[str]]:
+    """ asks all questions one after another in one dialog. 
+        The answers (buttons[0] or buttons[1] for every question) are posted to the originator in one DialogQueueMessage, 
+        and are also the result of the returned future (to be awaited in a worker, as with push_screen_wait).
+    """
+    result = asyncio.get_running_loop().create_future()
+    questions = list(questions)
+    def __callback_verify_all(results: list[str]):
+        originator.post_message(DialogQueueMessage(results, originator_key))
+        if not result.done():
+            result.set_result(results)
+    if not questions:
+        __callback_verify_all([])
+    else:
+        originator.app.push_screen(DialogQueueScreen(questions, [ButtonDef(buttons[0], variant='success'), ButtonDef(buttons[1], variant='error'), 
+                                                                 ButtonDef(buttons[2], variant='success'), ButtonDef(buttons[3], variant='error')], 
+                                                     originator_key=originator_key), callback=__callback_verify_all)
+    return result
+def verify_cancel(originator: MessagePump, question: str, originator_key='verify_cancel', buttons=['Ja', 'Nee', 'Afbreken'])->str:
+    return run_dialog(originator, dialog_screen(originator.app, question, [ButtonDef(buttons[0], variant='success'), ButtonDef(buttons[1], variant='primary'), ButtonDef(buttons[2], variant='error')], 
+                                                originator_key=originator_key))
+
+if __name__ == "__main__":
+    from textual.widgets import Header, Footer
+    from textual.app import App
+
+    logging.basicConfig(filename='verify.log', filemode='w', format='%(module)s-%(funcName)s-%(lineno)d: %(message)s', level=logging.DEBUG)
+    class TestApp(App):
+        BINDINGS = [("v", "verify", "Verify"), ("c","verify_cancel", 'verify with cancel'), ("o", "verifyOK", "Verify with OK"), ("a", "verify_all", "Verify all")]
+        
+        def compose(self) -> ComposeResult:
+            yield Header()
+            yield Footer()
+    
+        async def action_verify(self) -> None:
+            """An action to test verify."""
+            result = verify(self, 'Wat is daarop uw antwoord? Wat is daarop uw antwoord? Wat is \ndaarop uw antwoord? Wat is daarop uw antwoord? ')
+            logging.debug(f'returned: {result}')            
+
+        async def action_verifyOK(self) -> None:
+            """An action to test verify."""
+            result = verify(self, 'Wat is daarop uw antwoord?', buttons = ['OK','Cancel'], originator_key='OKC')
+            logging.debug(f'returned: {result}')            
+
+        async def action_verify_cancel(self) -> None:
+            """An action to test verify."""
+            result = verify_cancel(self, 'Wat is daarop uw antwoord?')
+            logging.debug(f'returned: {result}')            
+
+        async def action_verify_all(self) -> None:
+            """An action to test verify_all."""
+            verify_all(self, [f'Bestand {n} verwerken?' for n in range(1, 11)], originator_key='all')
+
+        def on_dialog_queue_message(self, event: DialogQueueMessage):
+            message_box(self, f'Antwoorden: {", ".join(event.results)}')
+
+        def on_dialog_message(self, event: DialogMessage):
+            logging.debug(f'resultaat: {event.result_str} {event.originator_key}')
+            match event.originator_key:
+                case 'verify':
+                    message_box(self, f'Het antwoord is resultaat: {event.result_str} {event.originator_key}')
+                case 'verify_cancel':
+                    message_box(self, f'Het antwoord is met cancel\nresultaat: {event.result_str} {event.originator_key}')
+                case 'OKC':
+                    message_box(self, f'Het antwoord is resultaat: {event.result_str} {event.originator_key}')
+
+    app = TestApp()
+    app.run()
\ No newline at end of file
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from typing import Callable, Iterable, Iterator
+
+from textual import work
+from textual.app import ComposeResult
+from textual.cache import LRUCache
+from textual.containers import Horizontal, Vertical
+from textual.message_pump import MessagePump
+from textual.screen import ModalScreen
+from textual.widgets import Button, Input, Label, OptionList, Select
+from textual.widgets.option_list import Option
+
+from .button_bar import ButtonBar, ButtonDef
+from .dialogs import DialogMessage, verify
+
+FileTypes = Iterable[tuple[str, str]]
+
+@dataclass(frozen=True)
+class FileEntry:
+    name: str
+    is_dir: bool
+    def sort_key(self)->tuple[bool, str]:
+        return (not self.is_dir, self.name.casefold())
+
+class DirectoryCache:
+    """ listings of visited directories (max_size directories), valid as long as the modification time of the directory does not change """
+    def __init__(self, max_size = 64):
+        self._listings: LRUCache[str, tuple[int, list[FileEntry]]] = LRUCache(max_size)
+    def get(self, path: str, mtime: int)->list[FileEntry]:
+        if (listing := self._listings.get(path)) and listing[0] == mtime:
+            return listing[1]
+        return None
+    def set(self, path: str, mtime: int, entries: list[FileEntry]):
+        self._listings[path] = (mtime, entries)
+    def discard(self, path: str):
+        self._listings.discard(path)
+
+_directory_cache = DirectoryCache()
+
+def _read_page(scan: Iterator[os.DirEntry], page_size: int)->list[FileEntry]:
+    page = []
+    for entry in scan:
+        try:
+            page.append(FileEntry(entry.name, entry.is_dir()))
+        except OSError:
+            page.append(FileEntry(entry.name, False))
+        if len(page) >= page_size:
+            break
+    return page
+
+async def scan_directory(path: str, page_size = 500, cache: DirectoryCache = _directory_cache):
+    """ async generator of the entries of a directory in pages of page_size entries, sorted (directories first) if they come from the cache.
+        scandir runs on a thread, so the event loop never waits for a (slow or large) directory.
+        A complete listing is cached, the cached listing is used as long as the directory does not change.
+    """
+    mtime = (await asyncio.to_thread(os.stat, path)).st_mtime_ns
+    if (entries := cache.get(path, mtime)) is not None:
+        for start in range(0, len(entries), page_size):
+            yield entries[start:start+page_size]
+        return
+    entries = []
+    scan = await asyncio.to_thread(os.scandir, path)
+    try:
+        while (page := await asyncio.to_thread(_read_page, scan, page_size)):
+            entries.extend(page)
+            yield page
+    finally:
+        scan.close()
+    entries.sort(key=FileEntry.sort_key)
+    cache.set(path, mtime, entries)
+
+def _patterns(pattern: str)->list[str]:
+    """ a tkinter style pattern ('*.log *.txt', '*.*' for all files) as a list of fnmatch patterns """
+    return ['*' if part == '*.*' else part for part in pattern.split()]
+
+class FileDialog(ModalScreen[str]):
+    """ modal dialog to choose a file to save (save=True) or to open, with filetypes as in tkinter.filedialog ([('Log', '*.log'), ...]).
+        Directories are listed by scan_directory: pages are shown as they come in, visited directories come from the cache.
+        The result is the full filename, or None if the dialog is cancelled.
+    """
+    DEFAULT_CSS = """
+        FileDialog {
+            align: center middle;
+            background: wheat 50%;
+        }
+        FileDialog > Vertical {
+            width: 90;
+            max-width: 100%;
+            height: 30;
+            max-height: 100%;
+            border: thick $surface 50%;
+            background: $panel;
+        }
+        FileDialog #directory {
+            width: 1fr;
+            padding: 0 1;
+        }
+        FileDialog OptionList {
+            height: 1fr;
+        }
+        FileDialog Horizontal {
+            height: auto;
+        }
+        FileDialog #filename {
+            width: 1fr;
+        }
+        FileDialog #filetype {
+            width: 30;
+        }
+        FileDialog ButtonBar {
+            height: auto;
+        }
+    """
+    PAGE_SIZE = 500
+    PARENT = '..'
+    def __init__(self, title: str, save = True, filetypes: FileTypes = None, default_extension: str = '', directory: str = None, filename = ''):
+        self._title = title
+        self.save = save
+        self._filetypes = list(filetypes) if filetypes else [('All files', '*.*')]
+        self.default_extension = default_extension
+        self.directory = os.path.abspath(os.path.expanduser(directory or os.getcwd()))
+        self._filename = filename
+        self._entries: list[FileEntry] = []
+        self._complete = False
+        super().__init__()
+    def compose(self)->ComposeResult:
+        with Vertical() as dialog:
+            dialog.border_title = self._title
+            yield Label(self.directory, id='directory')
+            yield OptionList(markup=False)
+            with Horizontal():
+                yield Input(self._filename, placeholder='bestandsnaam', id='filename')
+                yield Select([(f'{label} ({pattern})', pattern) for label, pattern in self._filetypes], value=self._filetypes[0][1], allow_blank=False, id='filetype')
+            yield ButtonBar([ButtonDef('Save' if self.save else 'Open', variant='primary', id='accept'), ButtonDef('Cancel', variant='error', id='cancel')])
+    def on_mount(self):
+        self._options = self.query_one(OptionList)
+        self._patterns = _patterns(self._filetypes[0][1])
+        self.query_one('#filename' if self.save else OptionList).focus()
+        self.change_directory(self.directory)
+    def change_directory(self, path: str):
+        self.directory = os.path.abspath(path)
+        self.query_one('#directory', Label).update(self.directory)
+        self.__list_directory(self.directory)
+    @work(exclusive=True, group='list_directory')
+    async def __list_directory(self, path: str):
+        self._entries = []
+        self._complete = False
+        self._options.clear_options()
+        if os.path.dirname(path) != path:
+            self._options.add_option(Option(f'{self.PARENT}/', id=self.PARENT))
+        try:
+            async for page in scan_directory(path, self.PAGE_SIZE):
+                self._entries.extend(page)
+                self._options.add_options(self.__options(page))
+        except OSError as E:
+            self.notify(f'{path}: {E.strerror}', severity='error')
+            return
+        self._complete = True
+        self._entries.sort(key=FileEntry.sort_key)
+        self.__show_entries()
+    def __options(self, entries: Iterable[FileEntry])->list[Option]:
+        return [Option(f'{entry.name}/' if entry.is_dir else entry.name, id=entry.name) for entry in entries
+                if entry.is_dir or any(fnmatch(entry.name, pattern) for pattern in self._patterns)]
+    def __show_entries(self):
+        highlighted = self._options.highlighted
+        self._options.clear_options()
+        if os.path.dirname(self.directory) != self.directory:
+            self._options.add_option(Option(f'{self.PARENT}/', id=self.PARENT))
+        self._options.add_options(self.__options(self._entries))
+        if highlighted is not None and self._options.option_count:
+            self._options.highlighted = min(highlighted, self._options.option_count - 1)
+    def on_select_changed(self, event: Select.Changed):
+        event.stop()
+        self._patterns = _patterns(event.value)
+        if self._complete:
+            self.__show_entries()
+        else:
+            self.__list_directory(self.directory)
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected):
+        event.stop()
+        name = event.option.id
+        if name == self.PARENT:
+            self.change_directory(os.path.dirname(self.directory))
+        elif os.path.isdir(filename := os.path.join(self.directory, name)):
+            self.change_directory(filename)
+        elif self.save:
+            self.query_one('#filename', Input).value = name
+            self.query_one('#filename', Input).focus()
+        else:
+            self.accept(filename)
+    def on_input_submitted(self, event: Input.Submitted):
+        event.stop()
+        self.accept(event.value)
+    def on_button_pressed(self, event: Button.Pressed):
+        event.stop()
+        match event.button.id:
+            case 'accept': self.accept(self.query_one('#filename', Input).value)
+            case 'cancel': self.dismiss(None)
+    def key_escape(self):
+        self.dismiss(None)
+    def accept(self, filename: str):
+        """ a directory is opened, a file is the result of the dialog (saving over an existing file has to be confirmed) """
+        if not (filename := filename.strip()):
+            return
+        filename = os.path.join(self.directory, os.path.expanduser(filename))
+        if os.path.isdir(filename):
+            self.query_one('#filename', Input).value = ''
+            self.change_directory(filename)
+            return
+        if self.save:
+            if self.default_extension and not os.path.splitext(filename)[1]:
+                filename += self.default_extension
+            if os.path.exists(filename):
+                self._overwrite = filename
+                verify(self, f'{os.path.basename(filename)} bestaat al.\nOverschrijven?', originator_key='overwrite')
+                return
+            _directory_cache.discard(self.directory)
+        elif not os.path.isfile(filename):
+            self.notify(f'{filename} bestaat niet', severity='error')
+            return
+        self.dismiss(filename)
+    def on_dialog_message(self, event: DialogMessage):
+        if event.originator_key == 'overwrite':
+            event.stop()
+            if str(event.result_str) == 'Ja':
+                self.dismiss(self._overwrite)
+
+def ask_filename(originator: MessagePump, callback: Callable[[str], None], title: str, save = True, filetypes: FileTypes = None,
+                default_extension = '', directory: str = None, filename = ''):
+    """ shows a FileDialog, callback is called with the chosen filename (not if the dialog is cancelled) """
+    def __callback_file_dialog(result: str):
+        if result:
+            callback(result)
+    originator.app.push_screen(FileDialog(title, save, filetypes, default_extension, directory, filename), callback=__callback_file_dialog)
+def ask_save_filename(originator: MessagePump, callback: Callable[[str], None], title='Opslaan', **kwdargs):
+    ask_filename(originator, callback, title, save=True, **kwdargs)
+def ask_open_filename(originator: MessagePump, callback: Callable[[str], None], title='Openen', **kwdargs):
+    ask_filename(originator, callback, title, save=False, **kwdargs)
+
+if __name__ == "__main__":
+    from textual.app import App
+    from textual.widgets import Footer, Header
+    from .dialogs import message_box
+
+    logging.basicConfig(filename='file_dialog.log', filemode='w', format='%(module)s-%(funcName)s-%(lineno)d: %(message)s', level=logging.DEBUG)
+    class TestApp(App):
+        BINDINGS = [('s', 'save', 'Save as'), ('o', 'open', 'Open')]
+        FILETYPES = [('Python', '*.py'), ('Text', '*.txt *.md'), ('All files', '*.*')]
+        def compose(self) -> ComposeResult:
+            yield Header()
+            yield Footer()
+        def action_save(self):
+            ask_save_filename(self, lambda filename: message_box(self, f'Opslaan als {filename}'), filetypes=self.FILETYPES, default_extension='.py')
+        def action_open(self):
+            ask_open_filename(self, lambda filename: message_box(self, f'Openen: {filename}'), filetypes=self.FILETYPES)
+
+    app = TestApp()
+    app.run()
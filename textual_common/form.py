@@ -0,0 +1,123 @@
+import asyncio
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Iterable
+
+from textual.containers import VerticalScroll
+from textual.app import ComposeResult
+from textual.validation import ValidationResult
+from textual.widgets import Static
+
+from .labeled_input import LabeledInput
+from .validation import validate_value
+
+@dataclass
+class FieldDef:
+    id: str
+    label: str
+    horizontal: bool = False
+    width: int = None
+    button: bool = False
+    validators: object = None
+    value: str = ''
+    @property
+    def height(self)->int:
+        return 3 if self.horizontal else 4
+
+class FieldSlot(Static):
+    """ keeps the place (and the height) of a field in a Form until the field is mounted """
+    DEFAULT_CSS = """
+    FieldSlot {
+        width: 100%;
+    }
+    """
+    def __init__(self, field: FieldDef):
+        self.field = field
+        super().__init__()
+        self.styles.height = field.height
+
+class Form(VerticalScroll):
+    """ scrollable column of LabeledInputs for large forms.
+        Every field has a slot with a fixed height, the LabeledInput itself is only mounted when its slot scrolls into view
+        (with OVERSCAN rows around the viewport).
+        The values of the fields that are not mounted are kept in a dict, mounted fields are read through cached references,
+        so get_values() and set_values() never query the DOM.
+    """
+    OVERSCAN = 10
+    def __init__(self, fields: Iterable[FieldDef], **kwdargs):
+        self._slots = [FieldSlot(field) for field in fields]
+        self._tops = list(accumulate((slot.field.height for slot in self._slots), initial=0))
+        self._values = {slot.field.id: slot.field.value for slot in self._slots}
+        self._fields: dict[str, LabeledInput] = {}
+        super().__init__(**kwdargs)
+    def compose(self)->ComposeResult:
+        yield from self._slots
+    def on_mount(self):
+        self.call_after_refresh(self.__mount_visible)
+    def on_resize(self):
+        self.__mount_visible()
+    def watch_scroll_y(self, old_value: float, new_value: float):
+        super().watch_scroll_y(old_value, new_value)
+        self.__mount_visible()
+    def __mount_visible(self):
+        top = self.scroll_y - self.OVERSCAN
+        bottom = self.scroll_y + self.scrollable_content_region.height + self.OVERSCAN
+        first = max(0, bisect_right(self._tops, top) - 1)
+        for slot in self._slots[first:bisect_left(self._tops, bottom)]:
+            if slot.field.id not in self._fields:
+                self.__mount_field(slot)
+    def __mount_field(self, slot: FieldSlot):
+        field = slot.field
+        self._fields[field.id] = LabeledInput(field.label, field.horizontal, width=field.width, button=field.button,
+                                              validators=field.validators, value=self._values[field.id], id=field.id)
+        slot.mount(self._fields[field.id])
+    def field(self, id: str)->LabeledInput:
+        """ the LabeledInput of a field, None if it is not mounted (yet) """
+        return self._fields.get(id)
+    def get_values(self)->dict[str, str]:
+        return {id: field.value if (field := self._fields.get(id)) else value for id, value in self._values.items()}
+    async def validate_all(self)->dict[str, ValidationResult]:
+        """ validates all fields with validators at the same time (threaded and async validators run in parallel),
+            mounted fields show the result
+        """
+        fields = [slot.field for slot in self._slots if slot.field.validators is not None]
+        return dict(zip((field.id for field in fields), await asyncio.gather(*(self.__validate(field) for field in fields))))
+    async def __validate(self, field: FieldDef)->ValidationResult:
+        if (labeled_input := self._fields.get(field.id)):
+            return await labeled_input.validate()
+        return await validate_value(field.validators, self._values[field.id])
+    def set_values(self, values: dict[str, str]):
+        for id, value in values.items():
+            if id not in self._values:
+                raise KeyError(f'no field {id} in form')
+            self._values[id] = value
+            if (field := self._fields.get(id)):
+                field.value = value
+
+if __name__ == "__main__":
+    import logging
+    from textual.app import App
+    from textual.widgets import Footer
+    from .required import Required
+    from .validation import PathExists, Validation
+    class TestApp(App):
+        BINDINGS = [('v', 'values', 'Show values'), ('c', 'clear', 'Clear values'), ('a', 'validate_all', 'Validate all')]
+        def compose(self) -> ComposeResult:
+            yield Form([FieldDef(f'field{n}', f'Veld {n}', horizontal=n % 3 != 0, button=n % 5 == 0, 
+                                 validators=Validation(PathExists(), thread=True) if n % 5 == 0 else Required(), value=str(n))
+                        for n in range(500)])
+            yield Footer()
+        def action_values(self):
+            values = self.query_one(Form).get_values()
+            self.notify(f'{len(values)} values, {sum(1 for value in values.values() if value)} filled in')
+        async def action_validate_all(self):
+            results = await self.query_one(Form).validate_all()
+            self.notify(f'{sum(1 for result in results.values() if result and not result.is_valid)} of {len(results)} fields are not valid')
+        def action_clear(self):
+            form = self.query_one(Form)
+            form.set_values({id: '' for id in form.get_values()})
+
+    logging.basicConfig(filename='testing.log', filemode='w', format='%(module)s-%(funcName)s-%(lineno)d: %(message)s', level=logging.DEBUG)
+    app = TestApp()
+    app.run()
@@ -1,53 +1,64 @@
 from textual.app import ComposeResult
 from textual.css.scalar import Scalar, Unit
+from textual.validation import ValidationResult
 from textual.widgets import Static, Label, Input, Button
-from textual.events import Resize
 import logging
 
+from .validation import ValidatedInput, validated_input
+
 class InputWithButton(Static):
     DEFAULT_CSS = """
     InputWithButton {
         height: 3;
+        width: 100%;
         layout: horizontal;
     }
+    InputWithButton > Input {
+        width: 1fr;
+    }
     .small {
         max-width: 5;
         min-width: 5;
     }
     """
-    def __init__(self, width=None, **kwdargs):
+    def __init__(self, width=None, value='', **kwdargs):
         self._width = width
+        self._value = value
         self._validators = kwdargs.pop('validators', None)
+        self._input: Input = None
+        self._button: Button = None
         super().__init__(**kwdargs)
+        if width:
+            self.styles.width = Scalar(width, Unit.CELLS, Unit.WIDTH)
     def compose(self)->ComposeResult:
-        yield Input(id=self._input_id(), validators=self._validators)
-        yield Button('...', id=self._button_id(), classes='small')
+        self._input = validated_input(self._value, self._validators, id=self._input_id())
+        self._button = Button('...', id=self._button_id(), classes='small')
+        yield self._input
+        yield self._button
     def _input_id(self)->str:
         return f'{self.id}-input'
     def _button_id(self)->str:
         return f'{self.id}-button'
-    def on_mount(self):
-        if self._width:
-            self.styles.width = Scalar(self._width, Unit.CELLS, Unit.WIDTH)
-        else:
-            self.styles.width = Scalar(100, Unit.WIDTH, Unit.PERCENT)
-    @property
-    def _button_size(self)->int:
-        return 5
-    def on_resize(self, message: Resize):        
-        self.input.styles.width = message.size.width - self._button_size
     @property
     def input(self)->Input:
-        return self.query_one(Input)
+        return self._input
     @property
     def button(self)->Button:
-        return self.query_one(Button)
+        return self._button
+    async def validate(self)->ValidationResult:
+        """ validates the value now (without debounce), the input shows the result """
+        if isinstance(self._input, ValidatedInput):
+            return await self._input.validate_now()
+        return self._input.validate(self._input.value)
     @property
     def value(self)->str:
-        return self.input.value
+        return self._input.value if self._input else self._value
     @value.setter
     def value(self, value: str):
-        self.input.value = value
+        if self._input:
+            self._input.value = value
+        else:
+            self._value = value
 
 class LabeledInput(Static):
     HORIZONTAL = 'labeled_input--horizontal'
@@ -55,65 +66,75 @@ class LabeledInput(Static):
     COMPONENT_CLASSES = [HORIZONTAL, VERTICAL]
 
     DEFAULT_CSS = """
+    LabeledInput {
+        width: 100%;
+    }
     LabeledInput.labeled_input--horizontal {
         layout: horizontal;
     }
-    LabeledInput.labeled_input--horizontal Label {
+    LabeledInput.labeled_input--horizontal > Label {
         align-vertical: middle;
         margin: 1 1 0 0;
+        width: auto;
     }
-    LabeledInput.labeled_input--horizontal Input {
-        max-width: 100%;
+    LabeledInput.labeled_input--horizontal > Input, LabeledInput.labeled_input--horizontal > InputWithButton {
+        width: 1fr;
     }
     LabeledInput.labeled_input--vertical {
         layout: vertical;
         align-horizontal: left;
         margin: 0 0 0 0;
-        width: 100%;
         max-width: 100%;
     }
+    LabeledInput.labeled_input--vertical > Input, LabeledInput.labeled_input--vertical > InputWithButton {
+        width: 100%;
+    }
     """
-    def __init__(self, label_text, horizontal=False, width=None, button=False, **kwdargs):
+    def __init__(self, label_text, horizontal=False, width=None, button=False, value='', **kwdargs):
         self._label_text = label_text
         self._width = width
+        self._value = value
         self._validators = kwdargs.pop('validators', None)
         self._button = button
+        self._label: Label = None
+        self._input: Input | InputWithButton = None
         super().__init__('', **kwdargs, classes = LabeledInput.HORIZONTAL if horizontal else LabeledInput.VERTICAL)
+        if width:
+            self.styles.width = Scalar(width, Unit.CELLS, Unit.WIDTH)
     def compose(self)->ComposeResult:
-        yield Label(self._label_text, id=self._label_id())
+        self._label = Label(self._label_text, id=self._label_id())
         if self._button:
-            yield InputWithButton(id=self._input_id(), validators=self._validators, width=self._width)
-        else:
-            yield Input('', id=self._input_id(), validators=self._validators) 
-    def on_mount(self):
-        if self._width:
-            self.styles.width = Scalar(self._width, Unit.CELLS, Unit.WIDTH)
+            self._input = InputWithButton(id=self._input_id(), validators=self._validators, value=self._value)
         else:
-            self.styles.width = Scalar(100, Unit.WIDTH, Unit.PERCENT)
+            self._input = validated_input(self._value, self._validators, id=self._input_id())
+        yield self._label
+        yield self._input
     def _label_id(self)->str:
         return f'{self.id}-label'
     def _input_id(self)->str:
         return f'{self.id}-input'
     @property
-    def input(self)->Input:
-        return self.query_one(f'#{self._input_id()}', Input)
-    def on_resize(self, message: Resize):        
-        if self.horizontal:
-            self.input.styles.width = message.size.width - len(self._label_text)-1 
-        else:
-            self.input.styles.width = message.size.width 
-    @property
     def input(self)->Input | InputWithButton:
-        return self.query_one(f'#{self._input_id()}')
+        return self._input
     @property
     def value(self)->str:
-        return self.input.value
+        return self._input.value if self._input else self._value
     @value.setter
     def value(self, value: str):
-        self.input.value = value
+        if self._input:
+            self._input.value = value
+        else:
+            self._value = value
     @property
     def label(self)->Label:
-        return self.query_one(f'#{self._label_id()}', Label)
+        return self._label
+    async def validate(self)->ValidationResult:
+        """ validates the value now (without debounce), the input shows the result """
+        if isinstance(self._input, InputWithButton):
+            return await self._input.validate()
+        if isinstance(self._input, ValidatedInput):
+            return await self._input.validate_now()
+        return self._input.validate(self._input.value)
     @property
     def horizontal(self)->bool:
         return LabeledInput.HORIZONTAL in self.classes 
@@ -125,7 +146,7 @@ if __name__ == "__main__":
     import logging
     from textual.app import App
     from textual.widgets import Footer
-    from required import Required
+    from .required import Required
     class TestApp(App):
         BINDINGS = [
                     ('t', 'toggle_', 'Toggle horizontal'),
@@ -0,0 +1,82 @@
+from threading import Lock
+
+class SingletonMeta(type):
+    """
+    This is a thread-safe implementation of Singleton.
+    adapted from https://refactoring.guru/design-patterns/singleton/python/example#example-1
+    """
+    _instances = {}
+    _lock: Lock = Lock()
+    """
+    We now have a lock object that will be used to synchronize threads during
+    first access to the Singleton. Every class gets its own lock (see __init__),
+    so creating one singleton does not wait for another.
+    """
+    def __init__(cls, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        cls._lock = Lock()
+    def __call__(cls, *args, **kwargs):
+        """
+        Possible changes to the value of the `__init__` argument do not affect
+        the returned instance.
+        """
+        # Fast path: once the instance exists it is never replaced, so it can
+        # be returned without taking the lock.
+        if (instance := cls._instances.get(cls)) is not None:
+            return instance
+        # Now, imagine that the program has just been launched. Since there's no
+        # Singleton instance yet, multiple threads can simultaneously pass the
+        # previous conditional and reach this point almost at the same time. The
+        # first of them will acquire lock and will proceed further, while the
+        # rest will wait here.
+        with cls._lock:
+            # The first thread to acquire the lock, reaches this conditional,
+            # goes inside and creates the Singleton instance. Once it leaves the
+            # lock block, a thread that might have been waiting for the lock
+            # release may then enter this section. But since the Singleton field
+            # is already initialized, the thread won't create a new object.
+            if cls not in cls._instances:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+        return cls._instances[cls]
+
+class Singleton(metaclass=SingletonMeta):
+    pass
+
+if __name__ == "__main__":
+    import time
+    from threading import Thread
+
+    class LockedSingletonMeta(type):
+        """ the previous implementation: one global lock, taken on every call """
+        _instances = {}
+        _lock: Lock = Lock()
+        def __call__(cls, *args, **kwargs):
+            with cls._lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super().__call__(*args, **kwargs)
+            return cls._instances[cls]
+
+    class Locked(metaclass=LockedSingletonMeta):
+        pass
+    class LockFree(Singleton):
+        pass
+
+    def measure(cls: type, n_threads: int, calls: int)->float:
+        def lookup():
+            for _ in range(calls):
+                cls()
+        threads = [Thread(target=lookup) for _ in range(n_threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    CALLS = 100000
+    for n_threads in [1, 4, 16, 64]:
+        locked = measure(Locked, n_threads, CALLS)
+        lock_free = measure(LockFree, n_threads, CALLS)
+        total = n_threads * CALLS
+        print(f'{n_threads:3} threads, {total:9} calls: locked {locked:.3f}s ({total/locked:12,.0f}/s)  lock-free {lock_free:.3f}s ({total/lock_free:12,.0f}/s)  x{locked/lock_free:.1f}')
@@ -0,0 +1,1573 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import gzip
+import json
+import mmap
+import multiprocessing
+import os
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import traceback
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum, auto
+from queue import Empty, SimpleQueue
+from threading import Condition, Event, Lock, Thread, Timer, get_ident
+from rich.cells import cell_len
+from rich.segment import Segment
+from rich.style import Style
+from typing import Callable, Iterable, Iterator, Protocol
+from textual import work
+from textual.app import ComposeResult
+from textual.cache import LRUCache
+from textual.containers import Horizontal
+from textual.geometry import Size
+from textual.screen import Screen
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Button, Checkbox, Input, Select, Static, TabbedContent, TabPane
+from textual.worker import Worker
+from textual.message import Message
+import logging
+
+from .button_bar import ButtonBar, ButtonDef
+from .file_dialog import ask_open_filename, ask_save_filename
+
+class TerminalWrite(Message):
+    class Level(Enum):
+        NORMAL = auto()
+        WARNING = auto()
+        ERROR  = auto()
+    def __init__(self, line: str, write_class: Level = Level.NORMAL, no_newline=False) -> None:
+        self.line = line
+        self.write_class = write_class
+        self.no_newline = no_newline
+        super().__init__()
+_LEVELS = {level.value: level for level in TerminalWrite.Level}
+# the text of a line is stored without its level, the prefix is added when it is shown or written to a text log
+_PREFIXES = {TerminalWrite.Level.WARNING: 'WARNING: ', TerminalWrite.Level.ERROR: 'ERROR: '}
+def _prefixed(level: TerminalWrite.Level, text: str)->str:
+    return _PREFIXES[level] + text if level in _PREFIXES else text
+def _split_level(line: str)->tuple[TerminalWrite.Level, str]:
+    """ the level and the text of a line of a text log """
+    for level, prefix in _PREFIXES.items():
+        if line.startswith(prefix):
+            return level, line[len(prefix):]
+    return TerminalWrite.Level.NORMAL, line
+# C0 control codes (but tab) and DEL: written raw they move the cursor or change the terminal state
+_CONTROL_CODES = dict.fromkeys([code for code in range(32) if code != 9] + [127])
+def _display_text(text: str)->str:
+    """ the text of a line as it is rendered: without control codes and with the tabs expanded """
+    return text.translate(_CONTROL_CODES).expandtabs()
+def _display_width(text: str)->int:
+    # printable ascii (the common case) is one cell per character
+    return len(text) if text.isascii() and text.isprintable() else cell_len(_display_text(text))
+class TerminalBuffer:
+    """ thread-safe buffer between the producers (Console) and the TerminalScreen. 
+        Lines are drained in batches by the screen, so order is preserved over all levels.
+        The buffer holds at most `maxsize` lines (None: unbounded), `overflow` determines what happens when it is full.
+        A blocked producer gives up (the line is dropped) when its cancel token is set or the buffer is released.
+    """
+    class Overflow(Enum):
+        BLOCK = auto()
+        DROP_OLDEST = auto()
+        DROP_NEWEST = auto()
+        SAMPLE = auto()
+    WAIT_TIMEOUT = 0.1
+    def __init__(self, maxsize: int = None, overflow: Overflow = Overflow.BLOCK, sample_rate: int = 10):
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self._overflowed = 0
+        self._released = False
+        self._not_full = Condition(Lock())
+        self._lines: deque[tuple[str, TerminalWrite.Level, bool]] = deque()
+        self._first_put: float = None
+    def __len__(self)->int:
+        return len(self._lines)
+    def _full(self)->bool:
+        return self.maxsize is not None and len(self._lines) >= self.maxsize
+    def put(self, line: str, write_class: TerminalWrite.Level = TerminalWrite.Level.NORMAL, no_newline=False, force=False, 
+            cancel_token: CancelToken = None):
+        """ with force=True the line is always added, also if the buffer is full (used from the UI thread, which drains the buffer) """
+        with self._not_full:
+            if self._full() and not force:
+                match self.overflow:
+                    case TerminalBuffer.Overflow.BLOCK:
+                        while self._full():
+                            if self._released or (cancel_token is not None and cancel_token.cancelled):
+                                self.dropped += 1
+                                return
+                            self._not_full.wait(self.WAIT_TIMEOUT)
+                    case TerminalBuffer.Overflow.DROP_OLDEST:
+                        self._lines.popleft()
+                        self.dropped += 1
+                    case TerminalBuffer.Overflow.DROP_NEWEST:
+                        self.dropped += 1
+                        return
+                    case TerminalBuffer.Overflow.SAMPLE:
+                        self.dropped += 1
+                        self._overflowed += 1
+                        if self._overflowed % self.sample_rate:
+                            return
+                        self._lines.popleft()
+            if not self._lines:
+                self._first_put = time.monotonic()
+            self._lines.append((line, write_class, no_newline))
+    def drain(self)->tuple[deque[tuple[str, TerminalWrite.Level, bool]], float]:
+        """ returns the buffered lines and the time (time.monotonic) the oldest of them was put """
+        with self._not_full:
+            lines, self._lines = self._lines, deque()
+            first_put, self._first_put = self._first_put, None
+            self._overflowed = 0
+            self._not_full.notify_all()
+        return lines, first_put
+    def release(self, released=True):
+        """ while released, producers do not wait for a full buffer to be drained (nobody will) """
+        with self._not_full:
+            self._released = released
+            self._not_full.notify_all()
+class Scrollback:
+    """ compact storage of the last `limit` lines written to the terminal.
+        Every line is a record of timestamp, level and the offset of its text in one utf-8 text buffer, all kept in arrays.
+        Once there are `limit//4` lines too many, the oldest records are spilled to a temporary file in one go, 
+        so the complete session can still be saved (see snapshot).
+        Records also have an absolute number, which does not change when older records are trimmed: 
+        record `index` has number `trimmed + index`. The numbers of the warnings and errors are indexed.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.max_width = 0
+        self.trimmed = 0
+        self._slack = max(1, limit // 4)
+        self._times = array('d')
+        self._levels = bytearray()
+        self._offsets = array('Q')
+        self._text = bytearray()
+        self._spill = None
+        self._spill_lock = Lock()
+        self._spilled = 0
+        self._flagged = {TerminalWrite.Level.WARNING: array('Q'), TerminalWrite.Level.ERROR: array('Q')}
+    def __len__(self)->int:
+        return len(self._offsets)
+    def __iter__(self):
+        for index in range(len(self._offsets)):
+            yield self[index]
+    def __getitem__(self, index: int)->str:
+        start, end = self.__span(index)
+        return self._text[start:end].decode('utf-8')
+    def __span(self, index: int)->tuple[int, int]:
+        if index < 0:
+            index += len(self._offsets)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError('scrollback index out of range')
+        end = self._offsets[index+1] if index + 1 < len(self._offsets) else len(self._text)
+        return self._offsets[index], end - 1 # without the newline
+    def level(self, index: int)->TerminalWrite.Level:
+        return _LEVELS[self._levels[index]]
+    def timestamp(self, index: int)->float:
+        return self._times[index]
+    @property
+    def spilled(self)->int:
+        return self._spilled
+    def append(self, line: str, write_class: TerminalWrite.Level = TerminalWrite.Level.NORMAL, timestamp: float = None):
+        timestamp = timestamp or time.time()
+        for text in line.split('\n'):
+            self._offsets.append(len(self._text))
+            self._text += (text + '\n').encode('utf-8')
+            self._times.append(timestamp)
+            self._levels.append(write_class.value)
+            self.max_width = max(self.max_width, _display_width(text) + len(_PREFIXES.get(write_class, '')))
+            if (flagged := self._flagged.get(write_class)) is not None:
+                flagged.append(self.trimmed + len(self._offsets) - 1)
+        if len(self._offsets) > self.limit + self._slack:
+            self.__trim(len(self._offsets) - self.limit)
+    _CHUNK_HEADER = struct.Struct('<QQ')
+    def __trim(self, count: int):
+        cut = self._offsets[count]
+        with self._spill_lock:
+            if self._spill is None:
+                self._spill = tempfile.TemporaryFile()
+            # a chunk of records: the header (count, text size), then the timestamps, levels and text
+            self._spill.seek(0, 2)
+            self._spill.write(self._CHUNK_HEADER.pack(count, cut))
+            self._spill.write(self._times[:count].tobytes())
+            self._spill.write(self._levels[:count])
+            self._spill.write(self._text[:cut])
+        del self._text[:cut]
+        del self._times[:count]
+        del self._levels[:count]
+        self._offsets = array('Q', [offset - cut for offset in self._offsets[count:]])
+        self._spilled += count
+        self.trimmed += count
+        for flagged in self._flagged.values():
+            del flagged[:bisect_left(flagged, self.trimmed)]
+    def next_flagged(self, level: TerminalWrite.Level, after: int)->int:
+        """ absolute number of the first record with this level (WARNING or ERROR) after record number `after`, None if there is none """
+        flagged = self._flagged[level]
+        if (position := bisect_right(flagged, after)) < len(flagged):
+            return flagged[position]
+        return None
+    def clear(self):
+        self.trimmed += len(self._offsets)
+        for flagged in self._flagged.values():
+            del flagged[:]
+        self._times = array('d')
+        self._levels = bytearray()
+        self._offsets = array('Q')
+        self._text = bytearray()
+        self.max_width = 0
+        with self._spill_lock:
+            # a snapshot may still be reading the spill, it is closed when the last reference is gone
+            self._spill = None
+        self._spilled = 0
+    def snapshot(self)->Iterator[tuple[float, TerminalWrite.Level, str]]:
+        """ all records of the session, including the spilled ones, as (timestamp, level, text).
+            The records in memory are copied at once, so the snapshot can be read on another thread while lines are added.
+        """
+        with self._spill_lock:
+            spill, spill_size = self._spill, self._spill.seek(0, 2) if self._spill else 0
+        return self.__records(spill, spill_size, self._times[:], bytes(self._levels), self._offsets[:], bytes(self._text))
+    def __records(self, spill, spill_size: int, times: array, levels: bytes, offsets: array, text: bytes)->Iterator[tuple[float, TerminalWrite.Level, str]]:
+        position = 0
+        while position < spill_size:
+            with self._spill_lock:
+                spill.seek(position)
+                count, size = self._CHUNK_HEADER.unpack(spill.read(self._CHUNK_HEADER.size))
+                chunk_times = array('d')
+                chunk_times.frombytes(spill.read(8 * count))
+                chunk_levels = spill.read(count)
+                chunk_text = spill.read(size)
+                position = spill.tell()
+            for timestamp, level, line in zip(chunk_times, chunk_levels, chunk_text.decode('utf-8').split('\n')):
+                yield timestamp, _LEVELS[level], line
+        for timestamp, level, line in zip(times, levels, text.decode('utf-8').split('\n')):
+            yield timestamp, _LEVELS[level], line
+    def save(self, filename: str)->int:
+        return write_records(filename, self.snapshot())
+
+def log_format(filename: str)->tuple[bool, bool]:
+    """ (json, compressed): a log file is written and read as JSON Lines if its name ends in .jsonl (or .jsonl.gz), 
+        as text otherwise, and is gzip-compressed if the name ends in .gz
+    """
+    compressed = filename.lower().endswith('.gz')
+    return (filename[:-3] if compressed else filename).lower().endswith('.jsonl'), compressed
+def _open_log(filename: str, mode: str):
+    if log_format(filename)[1]:
+        return gzip.open(filename, mode + 't', encoding='utf-8', compresslevel=6)
+    return open(filename, mode, encoding='utf-8')
+def write_records(filename: str, records: Iterable[tuple[float, TerminalWrite.Level, str]], batch_size = 1000)->int:
+    """ streams (timestamp, level, text) records to a log file in the format of its name (see log_format), returns the number of records """
+    as_json = log_format(filename)[0]
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    count = 0
+    batch = []
+    with _open_log(filename, 'w') as file:
+        for timestamp, level, text in records:
+            if as_json:
+                batch.append(encode({'timestamp': datetime.datetime.fromtimestamp(timestamp).isoformat(), 'level': level.name, 'text': text}))
+            else:
+                batch.append(_prefixed(level, text))
+            if len(batch) >= batch_size:
+                file.write('\n'.join(batch) + '\n')
+                count += len(batch)
+                batch = []
+        if batch:
+            file.write('\n'.join(batch) + '\n')
+            count += len(batch)
+    return count
+def read_records(filename: str)->Iterator[tuple[float, TerminalWrite.Level, str]]:
+    """ reads the records from a log file written by write_records or LogWriter. 
+        Text logs have no timestamps (None), the level is taken from the WARNING:/ERROR: prefix of the line.
+    """
+    as_json = log_format(filename)[0]
+    with _open_log(filename, 'r') as file:
+        for line in file:
+            line = line.rstrip('\n')
+            if as_json:
+                if line:
+                    record = json.loads(line)
+                    yield datetime.datetime.fromisoformat(record['timestamp']).timestamp(), TerminalWrite.Level[record['level']], record['text']
+            else:
+                yield None, *_split_level(line)
+
+class MappedLog:
+    """ read-only view of a saved (uncompressed) log file, to be shown in a TerminalLog instead of the Scrollback.
+        The file is memory-mapped and a sparse index (the number of newlines before every block of BLOCK_SIZE bytes)
+        is built on a background thread. Only the blocks with the lines that are shown are read, 
+        so the first lines can be shown at once, whatever the size of the file.
+    """
+    BLOCK_SIZE = 65536
+    PROGRESS_BLOCKS = 1024
+    _NEWLINE = re.compile(b'\n')
+    def __init__(self, filename: str, on_progress: Callable[[], None] = None):
+        """ on_progress is called on the indexing thread and must not block (close() waits for that thread) """
+        self.filename = filename
+        self.trimmed = 0
+        self.max_width = 0
+        self.indexed = False
+        self._json = log_format(filename)[0]
+        self._on_progress = on_progress
+        self._file = open(filename, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b''
+        self._newlines = array('Q', [0]) # _newlines[block]: the number of newlines before the block
+        self._length = 0
+        self._blocks = LRUCache(64)
+        self._lines = LRUCache(1024)
+        self._closed = Event()
+        self._thread = Thread(target=self.__build_index, name=f'MappedLog({filename})', daemon=True)
+        self._thread.start()
+    def __len__(self)->int:
+        return self._length
+    def __getitem__(self, index: int)->str:
+        return self.__line(index)[1]
+    def level(self, index: int)->TerminalWrite.Level:
+        return self.__line(index)[0]
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+        if self._size:
+            self._map.close()
+        self._file.close()
+    def __build_index(self):
+        blocks = (self._size + self.BLOCK_SIZE - 1) // self.BLOCK_SIZE
+        newlines = 0
+        for block in range(blocks):
+            if self._closed.is_set():
+                return
+            newlines += self._map[block * self.BLOCK_SIZE:(block + 1) * self.BLOCK_SIZE].count(b'\n')
+            self._newlines.append(newlines)
+            if block % self.PROGRESS_BLOCKS == 0:
+                self.__progress(newlines)
+        self.indexed = True
+        self.__progress(newlines + (1 if self._size and self._map[-1] != ord('\n') else 0))
+    def __progress(self, length: int):
+        self._length = length
+        if self._on_progress and not self._closed.is_set():
+            self._on_progress()
+    def __newline(self, number: int)->int:
+        """ the position of newline `number` (counting from 1) """
+        block = bisect_left(self._newlines, number) - 1
+        if (positions := self._blocks.get(block)) is None:
+            positions = [match.start() for match in self._NEWLINE.finditer(self._map, block * self.BLOCK_SIZE, (block + 1) * self.BLOCK_SIZE)]
+            self._blocks[block] = positions
+        return positions[number - self._newlines[block] - 1]
+    def __line(self, index: int)->tuple[TerminalWrite.Level, str]:
+        if (line := self._lines.get(index)) is None:
+            if not 0 <= index < self._length:
+                raise IndexError('log index out of range')
+            start = self.__newline(index) + 1 if index else 0
+            if (end := self._map.find(b'\n', start)) < 0:
+                end = self._size
+            text = self._map[start:end].decode('utf-8', errors='replace').rstrip('\r')
+            if self._json:
+                try:
+                    record = json.loads(text)
+                    line = TerminalWrite.Level[record['level']], record['text']
+                except (ValueError, KeyError, TypeError):
+                    line = TerminalWrite.Level.NORMAL, text
+            else:
+                line = _split_level(text)
+            self.max_width = max(self.max_width, _display_width(_prefixed(*line)))
+            self._lines[index] = line
+        return line
+
+class LogFilter:
+    """ the records of a Scrollback with at least level `minimum_level` whose text contains `pattern` (a substring or a regular expression). 
+        The matching absolute record numbers are kept in an index that is extended with the new records on update(), 
+        so the complete scrollback is only scanned once.
+    """
+    def __init__(self, records: Scrollback, minimum_level: TerminalWrite.Level = None, pattern: str = '', regex = False, ignore_case = True):
+        self.records = records
+        self.minimum_level = minimum_level.value if minimum_level else 0
+        self.pattern = pattern
+        if regex:
+            self._match = re.compile(pattern, re.IGNORECASE if ignore_case else 0).search
+        elif ignore_case:
+            pattern = pattern.lower()
+            self._match = lambda text: pattern in text.lower()
+        else:
+            self._match = lambda text: pattern in text
+        self.matches = array('Q')
+        self._checked = records.trimmed
+        self.update()
+    def __len__(self)->int:
+        return len(self.matches)
+    def record(self, row: int)->int:
+        """ the index in the records of a row in the filtered view """
+        return self.matches[row] - self.records.trimmed
+    def row(self, number: int)->int:
+        """ the first row in the filtered view with absolute record number >= number """
+        return bisect_left(self.matches, number)
+    def __contains__(self, number: int)->bool:
+        return (row := self.row(number)) < len(self.matches) and self.matches[row] == number
+    def update(self)->int:
+        """ checks the new records, returns the number of matches that were trimmed from the records """
+        trimmed = self.records.trimmed
+        levels = self.records._levels
+        for index in range(max(self._checked, trimmed) - trimmed, len(self.records)):
+            if levels[index] >= self.minimum_level and (not self.pattern or self._match(self.records[index])):
+                self.matches.append(trimmed + index)
+        self._checked = trimmed + len(self.records)
+        if (removed := bisect_left(self.matches, trimmed)):
+            del self.matches[:removed]
+        return removed
+
+class LogWriter:
+    """ streams terminal lines to a log file as they arrive. 
+        The writes are buffered and done on a background thread, the file is flushed every `flush_interval` seconds.
+        The file is opened by the constructor, so an OSError is raised to the caller.
+    """
+    FLUSH_INTERVAL = 1.0
+    def __init__(self, filename: str, flush_interval: float = FLUSH_INTERVAL):
+        self.filename = filename
+        self._flush_interval = flush_interval
+        self.bytes_written = 0
+        self._file = open(filename, 'w', encoding='utf-8')
+        self._queue = SimpleQueue()
+        self._thread = Thread(target=self.__run, name=f'LogWriter({filename})', daemon=True)
+        self._thread.start()
+    def write(self, line: str):
+        self._queue.put(line)
+    def flush(self):
+        flushed = Event()
+        self._queue.put(flushed)
+        flushed.wait()
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+    def __run(self):
+        with self._file as file:
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    line = self._queue.get(timeout=self._flush_interval)
+                except Empty:
+                    pass
+                else:
+                    if line is None:
+                        break
+                    if isinstance(line, Event):
+                        file.flush()
+                        line.set()
+                        continue
+                    file.write(line + '\n')
+                    self.bytes_written += len(line.encode('utf-8')) + 1
+                if time.monotonic() - last_flush >= self._flush_interval:
+                    file.flush()
+                    last_flush = time.monotonic()
+
+@dataclass
+class ConsoleStats:
+    queue_depth: int = 0
+    lines_per_second: float = 0.0
+    latency: float = 0.0
+    total_lines: int = 0
+    dropped_lines: int = 0
+    log_bytes: int = 0
+    running: bool = False
+    run_time: float = 0.0
+    def __str__(self)->str:
+        return f'queue {self.queue_depth}  {self.lines_per_second:.0f} lines/s  latency {self.latency*1000:.0f} ms  ' \
+               f'{self.total_lines} lines ({self.dropped_lines} dropped)  log {self.log_bytes/1024:.0f} KiB  ' \
+               f'{"running" if self.running else "run"} {self.run_time:.1f}s'
+
+class CancelToken:
+    """ passed to a RunScript as `cancel_token`. The script should poll `cancelled` regularly and return when it is set. """
+    def __init__(self, event: Event = None):
+        self._event = event or Event()
+        self.reason = ''
+        self.cancel_time: float = None
+    @property
+    def cancelled(self)->bool:
+        return self._event.is_set()
+    def cancel(self, reason: str = 'by user'):
+        if not self._event.is_set():
+            self.reason = reason
+            self.cancel_time = time.monotonic()
+            self._event.set()
+class RunScript(Protocol):
+    def __call__(self, cancel_token: CancelToken, **kwdargs)->bool:
+        pass
+
+class TerminalChannel:
+    """ the output of one run (or of the console itself) in a TerminalScreen, shown in its own tab: 
+        a TerminalBuffer for the producers, a Scrollback, an optional log file and the state and statistics of the run.
+        Runs write to their own channel, so runs at the same time never wait for each other's buffer.
+    """
+    def __init__(self, name: str, id: str, scrollback: int, buffer_size: int, overflow: TerminalBuffer.Overflow, rate_samples: int):
+        self.name = name
+        self.id = id
+        self.buffer = TerminalBuffer(buffer_size, overflow)
+        self.scrollback = Scrollback(scrollback)
+        self.log = TerminalLog(self.scrollback)
+        self.progress_panel = ProgressPanel()
+        self.running = False
+        self.accepting = False
+        self.cancel_token: CancelToken = None
+        self.run_start: float = None
+        self.run_end: float = None
+        self.log_writer: LogWriter = None
+        self.log_filename: str = None
+        self.log_bytes = 0
+        self.total_lines = 0
+        self.latency = 0.0
+        self._reported_dropped = 0
+        self._rate_samples: deque[tuple[float, int]] = deque(maxlen=rate_samples)
+        self._ui_thread = get_ident()
+        self._progress: dict[str, tuple[float, str]] = {}
+        self._progress_lock = Lock()
+        self._progress_changed = False
+    def queue_write(self, line: str, write_class: TerminalWrite.Level = TerminalWrite.Level.NORMAL, no_newline=False, force=False):
+        # nothing drains the buffer while the screen is not mounted (as with an inactive Console, the output is not shown)
+        if self.accepting:
+            self.buffer.put(line, write_class, no_newline, force=force or get_ident() == self._ui_thread, cancel_token=self.cancel_token)
+        if (writer := self.log_writer):
+            writer.write(_prefixed(write_class, str(line)))
+    def print(self, msg: str):
+        self.queue_write(msg)
+    def warning(self, message: str):
+        self.queue_write(message, TerminalWrite.Level.WARNING)
+    def error(self, message: str):
+        self.queue_write(message, TerminalWrite.Level.ERROR)
+    def progress(self, task_id: str, fraction: float = None, message: str = ''):
+        # only the last value of a task is kept, the screen shows it at most every PROGRESS_INTERVAL seconds;
+        # a finished task leaves one line in the output, in order with the other output of the run
+        finished = fraction is not None and fraction >= 1
+        with self._progress_lock:
+            if finished:
+                self._progress.pop(task_id, None)
+            else:
+                self._progress[task_id] = (fraction, message)
+            self._progress_changed = True
+        if finished:
+            self.queue_write(f'{task_id}: {message or "done"}')
+    def take_progress(self)->dict[str, tuple[float, str]]:
+        """ the tasks in progress {task_id: (fraction, message)}, None if nothing changed since the last call """
+        if not self._progress_changed:
+            return None
+        with self._progress_lock:
+            self._progress_changed = False
+            return dict(self._progress)
+    def clear_progress(self):
+        with self._progress_lock:
+            self._progress.clear()
+            self._progress_changed = True
+    def drain(self)->tuple[deque[tuple[str, TerminalWrite.Level, bool]], float]:
+        """ the buffered lines (with a warning about dropped lines first) and the time the oldest was put, see TerminalBuffer.drain """
+        lines, first_put = self.buffer.drain()
+        if (dropped := self.buffer.dropped - self._reported_dropped):
+            self._reported_dropped += dropped
+            lines.appendleft((f'{dropped} lines dropped ({self.buffer.overflow.name}), {self._reported_dropped} in total', TerminalWrite.Level.WARNING, False))
+        self.total_lines += len(lines)
+        self._rate_samples.append((time.monotonic(), self.total_lines))
+        return lines, first_put
+    def start_running(self, cancel_token: CancelToken):
+        self.running = True
+        self.cancel_token = cancel_token
+        self.run_start = time.monotonic()
+    def stop_running(self):
+        self.running = False
+        self.run_end = time.monotonic()
+        self.clear_progress()
+    def cancel(self)->bool:
+        if self.running and self.cancel_token and not self.cancel_token.cancelled:
+            self.cancel_token.cancel()
+            self.queue_write('cancelling...', TerminalWrite.Level.WARNING)
+            return True
+        return False
+    def start_log(self, filename: str):
+        self.stop_log()
+        self.log_writer = LogWriter(filename)
+        self.log_filename = filename
+    def stop_log(self):
+        if self.log_writer:
+            self.log_writer.close()
+            self.log_bytes += self.log_writer.bytes_written
+            self.log_writer = None
+    def clear(self):
+        self.log.clear()
+        self.clear_progress()
+        if not self.log_writer:
+            self.log_filename = None
+    def stats(self)->ConsoleStats:
+        now = time.monotonic()
+        rate = 0.0
+        if len(self._rate_samples) > 1:
+            (first_time, first_total), (last_time, last_total) = self._rate_samples[0], self._rate_samples[-1]
+            if now - last_time < 1.0 and last_time > first_time:
+                rate = (last_total - first_total) / (last_time - first_time)
+        run_time = 0.0
+        if self.run_start is not None:
+            run_time = (now if self.running else self.run_end) - self.run_start
+        return ConsoleStats(queue_depth=len(self.buffer), lines_per_second=rate, latency=self.latency, total_lines=self.total_lines, 
+                            dropped_lines=self.buffer.dropped, log_bytes=self.log_bytes + (self.log_writer.bytes_written if self.log_writer else 0),
+                            running=self.running, run_time=run_time)
+
+# the channel of the run that is executing in this context (thread or task), see console_print
+_current_channel: ContextVar[TerminalChannel] = ContextVar('terminal_channel', default=None)
+
+class TerminalLog(ScrollView, can_focus=True):
+    """ virtualized view on a Scrollback: one row per record, only the rows in the viewport are rendered. 
+        The cost of scrolling and resizing does not depend on the number of lines.
+        Other records (a MappedLog) can be shown instead with view(), lines are still written to the Scrollback.
+    """
+    COMPONENT_CLASSES = {'terminal-log--warning', 'terminal-log--error'}
+    DEFAULT_CSS = """
+        TerminalLog {
+            background: $surface;
+            color: $foreground;
+            overflow-y: scroll;
+        }
+        TerminalLog > .terminal-log--warning {
+            color: darkorange;
+        }
+        TerminalLog > .terminal-log--error {
+            color: red;
+        }
+    """
+    _highlight_style = Style(reverse=True)
+    def __init__(self, records: Scrollback, auto_scroll = True, **kwdargs):
+        self.records = records
+        self.scrollback = records
+        self.auto_scroll = auto_scroll
+        self._level_styles: dict[TerminalWrite.Level, Style] = {}
+        self._trimmed = records.trimmed
+        self._update_pending = False
+        self.log_filter: LogFilter = None
+        self.highlight: int = None
+        super().__init__(**kwdargs)
+    def notify_style_update(self):
+        super().notify_style_update()
+        self._level_styles.clear()
+    def _level_style(self, level: TerminalWrite.Level)->Style:
+        if (style := self._level_styles.get(level)) is None:
+            match level:
+                case TerminalWrite.Level.WARNING: style = self.rich_style + self.get_component_rich_style('terminal-log--warning', partial=True)
+                case TerminalWrite.Level.ERROR: style = self.rich_style + self.get_component_rich_style('terminal-log--error', partial=True)
+                case _: style = self.rich_style
+            self._level_styles[level] = style
+        return style
+    def write(self, line: str, write_class: TerminalWrite.Level = TerminalWrite.Level.NORMAL, timestamp: float = None):
+        self.scrollback.append(line, write_class, timestamp)
+        if self.viewing_scrollback:
+            self.records_changed()
+    def clear(self):
+        self.scrollback.clear()
+        if self.viewing_scrollback:
+            self.highlight = None
+            self.records_changed()
+    @property
+    def viewing_scrollback(self)->bool:
+        return self.records is self.scrollback
+    def view(self, records: MappedLog = None):
+        """ shows `records` instead of the scrollback, None: shows the scrollback again """
+        self.records = records if records is not None else self.scrollback
+        self._trimmed = self.records.trimmed
+        self.log_filter = None
+        self.highlight = None
+        self.virtual_size = Size(self.records.max_width, self.row_count)
+        if self.viewing_scrollback:
+            self.scroll_end(animate=False, immediate=False, x_axis=False)
+        else:
+            self.scroll_home(animate=False)
+        self.refresh()
+    def set_filter(self, log_filter: LogFilter):
+        """ shows only the records in log_filter (None: all records) """
+        self.log_filter = log_filter
+        self.virtual_size = Size(self.records.max_width, self.row_count)
+        if self.highlight is not None:
+            self.show_record(self.highlight)
+        else:
+            self.scroll_end(animate=False, immediate=False, x_axis=False)
+        self.refresh()
+    @property
+    def row_count(self)->int:
+        return len(self.log_filter) if self.log_filter is not None else len(self.records)
+    def _record(self, row: int)->int:
+        return self.log_filter.record(row) if self.log_filter is not None else row
+    @property
+    def top_record(self)->int:
+        """ absolute number of the first record in the viewport """
+        if self.row_count == 0:
+            return self.records.trimmed
+        return self.records.trimmed + self._record(min(self.scroll_offset.y, self.row_count - 1))
+    def show_record(self, number: int):
+        """ highlights the record with absolute number `number` and scrolls it into the middle of the view """
+        self.highlight = number
+        row = self.log_filter.row(number) if self.log_filter is not None else number - self.records.trimmed
+        self.scroll_to(y=max(0, row - self.scrollable_content_region.height // 2), animate=False)
+        self.refresh()
+    def records_changed(self):
+        """ the records were changed (possibly from outside the widget), the size is updated once for a batch of changes """
+        if not self._update_pending:
+            self._update_pending = True
+            self.call_later(self.__update_size)
+    def __update_size(self):
+        self._update_pending = False
+        trimmed, self._trimmed = self.records.trimmed - self._trimmed, self.records.trimmed
+        if self.log_filter is not None:
+            trimmed = self.log_filter.update()
+        follow = self.auto_scroll and self.viewing_scrollback and self.scroll_y >= self.max_scroll_y
+        self.virtual_size = Size(self.records.max_width, self.row_count)
+        if follow:
+            self.scroll_end(animate=False, immediate=False, x_axis=False)
+        elif trimmed:
+            self.scroll_to(y=max(0, self.scroll_y - trimmed), animate=False)
+        self.refresh()
+    def render_line(self, y: int)->Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        row = scroll_y + y
+        width = self.scrollable_content_region.width
+        if row >= self.row_count:
+            return Strip.blank(width, self.rich_style)
+        index = self._record(row)
+        level = self.records.level(index)
+        style = self._level_style(level)
+        if self.highlight == self.records.trimmed + index:
+            style += self._highlight_style
+        return Strip([Segment(_display_text(_prefixed(level, self.records[index])), style)]).crop_extend(scroll_x, scroll_x + width, self.rich_style)
+
+class ProgressPanel(Static):
+    """ the progress lines of the tasks of a channel (see console_progress), below its output """
+    DEFAULT_CSS = """
+        ProgressPanel {
+            height: auto;
+            max-height: 10;
+            padding: 0 1;
+            background: black;
+            color: yellowgreen;
+            display: none;
+        }
+    """
+    BAR_WIDTH = 30
+    def __init__(self, **kwdargs):
+        super().__init__(markup=False, **kwdargs)
+    def show_tasks(self, tasks: dict[str, tuple[float, str]]):
+        self.display = bool(tasks)
+        if tasks:
+            width = max(len(task_id) for task_id in tasks)
+            self.update('\n'.join(self.__line(task_id.ljust(width), fraction, message) for task_id, (fraction, message) in tasks.items()))
+    def __line(self, task_id: str, fraction: float, message: str)->str:
+        if fraction is None:
+            return f'{task_id}  {message}'
+        filled = round(max(0.0, min(1.0, fraction)) * self.BAR_WIDTH)
+        return f'{task_id}  {"█" * filled}{"░" * (self.BAR_WIDTH - filled)} {fraction:4.0%}  {message}'
+
+class TerminalForm(Static):
+    def __init__(self, panes: Iterable[TabPane], status_bar = False, **kwdargs):
+        self._panes = list(panes)
+        self._status_bar = status_bar
+        super().__init__(**kwdargs)
+    def compose(self)->ComposeResult:
+        with Horizontal(id='search_bar'):
+            yield Input(placeholder='search', id='search')
+            yield Select([('warnings and errors', TerminalWrite.Level.WARNING), ('errors', TerminalWrite.Level.ERROR)], prompt='all levels', id='level')
+            yield Checkbox('regex', id='regex')
+            yield Button('Next error', id='next_error')
+        with TabbedContent(id='channels'):
+            yield from self._panes
+        if self._status_bar:
+            yield Static(id='status')
+        yield ButtonBar([ButtonDef('Save Log', variant= 'primary', id='save_log'),
+                         ButtonDef('Open Log', id='open_log'),
+                         ButtonDef('Cancel', variant= 'error', id='cancel'),
+                         ButtonDef('Close', variant ='success', id='close')])
+    @property
+    def status_bar(self)->Static:
+        return self.query_one('#status', Static) if self._status_bar else None
+
+class ChannelPane(TabPane):
+    def __init__(self, channel: TerminalChannel):
+        self.channel = channel
+        super().__init__(channel.name, channel.log, channel.progress_panel, id=channel.id)
+
+class TerminalScreen(Screen):
+    """ console output in a screen. The console itself writes to the main channel, every run gets a channel (and a tab) of its own, 
+        so several scripts can run at the same time. The search bar, buttons and status bar work on the channel in the active tab.
+    """
+    DEFAULT_CSS = """
+        TerminalScreen {
+            align: center middle;
+            background: black 50%;
+        }
+        TerminalForm {
+            width: 90%;
+            height: 90%;
+        }
+        TerminalForm TabbedContent {
+            height: 1fr;
+        }
+        TerminalForm TabPane {
+            height: 1fr;
+            padding: 0;
+        }
+        TerminalForm TerminalLog {
+            background: black;
+            color: lime;
+            border: round white;      
+            height: 1fr;
+            min-height: 20;
+            min-width: 80; 
+        }
+        TerminalForm #search_bar {
+            height: 3;
+        }
+        TerminalForm #search_bar Input {
+            width: 1fr;
+        }
+        TerminalForm #search_bar Select {
+            width: 28;
+        }
+        TerminalForm #status {
+            background: $panel;
+            color: yellowgreen;
+            height: 1;
+        }
+        TerminalScreen ButtonBar Button {
+            max-width: 20;
+            outline: solid yellowgreen;
+        }
+    """
+    BINDINGS = [('ctrl+f', 'search', 'Search'), ('f3', 'next_error', 'Next error')]
+    FLUSH_INTERVAL = 1/20
+    STATUS_INTERVAL = 1/2
+    PROGRESS_INTERVAL = 1/10
+    FILTER_DELAY = 0.3
+    SCROLLBACK = 10000
+    BUFFER_SIZE = 100000
+    PROCESS_START_METHOD = 'spawn'
+    CHUNK_SIZE = 65536
+    KILL_DELAY = 2.0
+    MAIN_CHANNEL = 'console'
+    def __init__(self, scrollback: int = SCROLLBACK, buffer_size: int = BUFFER_SIZE, overflow: TerminalBuffer.Overflow = TerminalBuffer.Overflow.BLOCK, 
+                 status_bar = False, **kwdargs):
+        self._scrollback_size = scrollback
+        self._buffer_size = buffer_size
+        self._overflow = overflow
+        self._status_bar = status_bar
+        self._channel_count = 0
+        self._accepting = False
+        self.channels: dict[str, TerminalChannel] = {}
+        self.main = self.__new_channel(self.MAIN_CHANNEL)
+        self.channel = self.main
+        self._filter_timer = None
+        self._viewer: MappedLog = None
+        self._viewer_log: TerminalLog = None
+        super().__init__(**kwdargs)
+    def compose(self) -> ComposeResult:
+        yield TerminalForm([ChannelPane(channel) for channel in self.channels.values()], status_bar=self._status_bar)
+    def on_mount(self):
+        self.__set_accepting(True)
+        self.set_interval(self.FLUSH_INTERVAL, self.flush)
+        self.set_interval(self.PROGRESS_INTERVAL, self.update_progress)
+        if self._status_bar:
+            self.set_interval(self.STATUS_INTERVAL, self.__update_status)
+    def on_unmount(self):
+        self.__set_accepting(False)
+    def __set_accepting(self, accepting: bool):
+        self._accepting = accepting
+        for channel in self.channels.values():
+            channel.accepting = accepting
+            channel.buffer.release(not accepting)
+    def __new_channel(self, name: str)->TerminalChannel:
+        self._channel_count += 1
+        channel = TerminalChannel(name, f'channel-{self._channel_count}', self._scrollback_size, self._buffer_size, self._overflow, 
+                                  round(1/self.FLUSH_INTERVAL))
+        channel.accepting = self._accepting
+        self.channels[name] = channel
+        return channel
+    def open_channel(self, name: str)->TerminalChannel:
+        """ the channel for a new run, in the active tab: the channel of a finished run with the same name is cleared and used again """
+        if (channel := self.channels.get(name)) is not None and channel is not self.main and not channel.running:
+            channel.clear()
+        else:
+            number = 1
+            while f'{name} {number}' in self.channels if number > 1 else name in self.channels:
+                number += 1
+            channel = self.__new_channel(name if number == 1 else f'{name} {number}')
+            if self.is_mounted:
+                self.query_one(TabbedContent).add_pane(ChannelPane(channel))
+        self.__activate(channel)
+        return channel
+    def close_channel(self, channel: TerminalChannel):
+        """ removes the tab of a finished run """
+        if channel is self.main or channel.running:
+            return
+        channel.stop_log()
+        if self.channel is channel:
+            self.__activate(self.main)
+        del self.channels[channel.name]
+        if self.is_mounted:
+            self.query_one(TabbedContent).remove_pane(channel.id)
+    def reset(self):
+        """ removes the channels of finished runs and clears the main channel """
+        self.__activate(self.main)
+        for channel in list(self.channels.values()):
+            self.close_channel(channel)
+        self.main.clear()
+    def __activate(self, channel: TerminalChannel):
+        self.channel = channel
+        if self.is_mounted:
+            self.query_one(TabbedContent).active = channel.id
+    def on_tabbed_content_tab_activated(self, message: TabbedContent.TabActivated):
+        message.stop()
+        if isinstance(message.pane, ChannelPane) and message.pane.channel is not self.channel:
+            self.channel = message.pane.channel
+            self.__show_viewer_state()
+            self.apply_filter()
+    @property
+    def scrollback(self)->Scrollback:
+        return self.channel.scrollback
+    @property
+    def running(self)->bool:
+        return any(channel.running for channel in self.channels.values())
+    def stats(self)->ConsoleStats:
+        return self.channel.stats()
+    def __update_status(self):
+        self.query_one(TerminalForm).status_bar.update(f'{self.channel.name}: {self.stats()}')
+    @property
+    def terminal(self)->TerminalLog:
+        return self.channel.log
+    def __script_wrapper(self, channel: TerminalChannel, script: RunScript, cancel_token: CancelToken, executor: str, **kwdargs):
+        match executor:
+            case 'thread': result = script(cancel_token=cancel_token, **kwdargs)
+            case 'process': result = self.__run_process(channel, script, cancel_token, **kwdargs)
+            case _: raise ValueError(f'unknown executor {executor}')
+        self.__ready(channel, str(result), cancel_token)
+    def __ready(self, channel: TerminalChannel, result: str, cancel_token: CancelToken):
+        status = f' (cancelled {cancel_token.reason}, stopped in {time.monotonic() - cancel_token.cancel_time:.2f}s)' if cancel_token.cancelled else ''
+        channel.queue_write(f'READY {result}{status}  {datetime.datetime.strftime(datetime.datetime.now(), "%d-%m-%Y, %H:%M:%S")}', force=True)
+    def __run_process(self, channel: TerminalChannel, script: RunScript, cancel_token: CancelToken, **kwdargs)->bool:
+        # the script runs in a worker process, its console output, result and exceptions come back through the queue
+        context = multiprocessing.get_context(self.PROCESS_START_METHOD)
+        queue = context.Queue()
+        cancel_event = context.Event()
+        process = context.Process(target=_process_main, args=(queue, cancel_event, script, kwdargs), daemon=True)
+        process.start()
+        result = False
+        while True:
+            if cancel_token.cancelled and not cancel_event.is_set():
+                cancel_event.set()
+            try:
+                kind, *payload = queue.get(timeout=0.1)
+            except Empty:
+                if process.is_alive() or not queue.empty():
+                    continue
+                channel.queue_write(f'worker process ended unexpectedly (exit code {process.exitcode})', TerminalWrite.Level.ERROR)
+                break
+            match kind:
+                case 'write': channel.queue_write(*payload)
+                case 'progress': channel.progress(*payload)
+                case 'result': 
+                    result = payload[0]
+                    break
+                case 'exception': 
+                    for line in payload[0].splitlines():
+                        channel.queue_write(line, TerminalWrite.Level.ERROR)
+                    break
+        process.join()
+        return result
+    def run(self, script: RunScript, log_file: str = None, timeout: float = None, executor: str = 'thread', channel: str = None, **kwdargs)->Worker:
+        """ runs the script on a worker thread (or in a worker process) in a channel of its own, named `channel` (default: the name of the script).
+            Runs do not wait for each other. console_print in the script writes to its channel: 
+            threads that the script starts itself should be started in a copy of its context (contextvars.copy_context().run).
+        """
+        if executor == 'process':
+            _ensure_resource_tracker()
+        channel = self.open_channel(channel or getattr(script, '__name__', 'run'))
+        # running from now on, so a next run with the same name gets a channel of its own
+        channel.start_running(CancelToken())
+        return self.__run_script(channel, script, log_file, timeout, executor, **kwdargs)
+    @work(thread=True, group='run')
+    def __run_script(self, channel: TerminalChannel, script: RunScript, log_file: str, timeout: float, executor: str, **kwdargs)->bool:
+        context = _current_channel.set(channel)
+        cancel_token = channel.cancel_token
+        timer = Timer(timeout, cancel_token.cancel, kwargs={'reason': f'after timeout of {timeout}s'}) if timeout else None
+        try:
+            if log_file:
+                self.__start_log(channel, log_file)
+            if timer:
+                timer.start()
+            self.__script_wrapper(channel, script, cancel_token, executor, **kwdargs)
+        finally:
+            if timer:
+                timer.cancel()
+            if log_file:
+                channel.stop_log()
+            channel.stop_running()
+            _current_channel.reset(context)
+    def run_command(self, argv: Iterable[str], log_file: str = None, timeout: float = None, 
+                    stderr_class: TerminalWrite.Level = TerminalWrite.Level.WARNING, encoding='utf-8', channel: str = None, **kwdargs)->Worker:
+        """ runs argv as a subprocess in a channel of its own (default: named after the program), see console_run_command """
+        argv = list(argv)
+        channel = self.open_channel(channel or os.path.basename(argv[0]))
+        channel.start_running(CancelToken())
+        return self.__run_command(channel, argv, log_file, timeout, stderr_class, encoding, **kwdargs)
+    @work(group='run')
+    async def __run_command(self, channel: TerminalChannel, argv: list[str], log_file: str, timeout: float, 
+                            stderr_class: TerminalWrite.Level, encoding: str, **kwdargs)->int:
+        cancel_token = channel.cancel_token
+        timer = Timer(timeout, cancel_token.cancel, kwargs={'reason': f'after timeout of {timeout}s'}) if timeout else None
+        try:
+            if log_file:
+                self.__start_log(channel, log_file)
+            try:
+                process = await asyncio.create_subprocess_exec(*argv, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, 
+                                                               stderr=asyncio.subprocess.PIPE, **kwdargs)
+            except OSError as E:
+                # a missing or not executable program should not end the app (the worker exits on errors)
+                channel.queue_write(f'can not run {argv[0]}: {E}', TerminalWrite.Level.ERROR)
+                self.__ready(channel, f'not started ({type(E).__name__})', cancel_token)
+                return None
+            if timer:
+                timer.start()
+            readers = asyncio.gather(self.__read_stream(channel, process.stdout, TerminalWrite.Level.NORMAL, encoding), 
+                                     self.__read_stream(channel, process.stderr, stderr_class, encoding))
+            while not readers.done():
+                await asyncio.wait([readers], timeout=0.1)
+                if cancel_token.cancelled:
+                    await self.__stop_process(process, readers)
+                    break
+            await readers
+            exit_code = await process.wait()
+            self.__ready(channel, f'exit code {exit_code}', cancel_token)
+            return exit_code
+        finally:
+            if timer:
+                timer.cancel()
+            if log_file:
+                await asyncio.to_thread(channel.stop_log)
+            channel.stop_running()
+    async def __stop_process(self, process: asyncio.subprocess.Process, readers: asyncio.Future):
+        """ terminates the process, it is killed when it is not done after KILL_DELAY seconds.
+            The output of a process that is gone can still be held open by its children: then the reading is ended.
+        """
+        # terminate and kill only once: signalling again may reap the process before asyncio does
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), self.KILL_DELAY)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        await asyncio.wait([readers], timeout=self.KILL_DELAY)
+        if not readers.done():
+            process.stdout.feed_eof()
+            process.stderr.feed_eof()
+    def __start_log(self, channel: TerminalChannel, log_file: str):
+        try:
+            channel.start_log(log_file)
+        except OSError as E:
+            # the run goes on without a log file
+            channel.queue_write(f'can not write log file {log_file}: {E}', TerminalWrite.Level.ERROR)
+    async def __read_stream(self, channel: TerminalChannel, stream: asyncio.StreamReader, write_class: TerminalWrite.Level, encoding: str):
+        pending = b''
+        while (chunk := await stream.read(self.CHUNK_SIZE)):
+            *lines, pending = (pending + chunk).split(b'\n')
+            for line in lines:
+                channel.queue_write(line.decode(encoding, errors='replace').rstrip('\r'), write_class)
+        if pending:
+            channel.queue_write(pending.decode(encoding, errors='replace').rstrip('\r'), write_class)
+    def cancel(self):
+        """ cancels the run in the active tab, in the main tab all runs are cancelled """
+        for channel in (self.channels.values() if self.channel is self.main else [self.channel]):
+            channel.cancel()
+    def start_log(self, filename: str):
+        self.main.start_log(filename)
+    def stop_log(self):
+        self.main.stop_log()
+    def queue_write(self, line: str, write_class: TerminalWrite.Level = TerminalWrite.Level.NORMAL, no_newline=False, force=False):
+        self.main.queue_write(line, write_class, no_newline, force)
+    def clear(self):
+        self.channel.clear()
+    def write(self, s: str):
+        self.terminal.write(str(s))
+    def write_line(self, s: str):
+        self.terminal.write(str(s))
+    def write_lines(self, lines:Iterable[str]):
+        for line in lines:
+            self.write_line(line)
+    def warning(self, message: str, warning_str: str = None):
+        """ the WARNING: prefix is added by the log, warning_str is an extra prefix """
+        self.terminal.write(f'{warning_str}: {message}' if warning_str else message, TerminalWrite.Level.WARNING)
+    def error(self, message: str, error_str: str = None):
+        self.terminal.write(f'{error_str}: {message}' if error_str else message, TerminalWrite.Level.ERROR)
+    def close(self):
+        if self._viewer:
+            self.close_viewer()
+        elif not self.running:
+            self.dismiss(True)
+    LOG_FILETYPES = [('Log', '*.log'), ('Compressed log', '*.log.gz'), ('JSON Lines', '*.jsonl'), ('Compressed JSON Lines', '*.jsonl.gz'), ('All files', '*.*')]
+    LOAD_BATCH = 10000
+    def save_log(self, filename: str):
+        """ saves the session of the active channel in the format of the filename (see log_format), on a background thread """
+        if self.channel.log_filename and log_format(filename) == (False, False):
+            self.__copy_log(self.channel, filename)
+        else:
+            self.__export(filename, self.scrollback.snapshot())
+    @work(thread=True)
+    def __copy_log(self, channel: TerminalChannel, filename: str):
+        if (writer := channel.log_writer):
+            writer.flush()
+        shutil.copyfile(channel.log_filename, filename)
+    @work(thread=True)
+    def __export(self, filename: str, records: Iterator[tuple[float, TerminalWrite.Level, str]]):
+        write_records(filename, records)
+    def open_log(self, filename: str):
+        """ shows a saved log without loading it: uncompressed logs are memory-mapped (see MappedLog), compressed logs are loaded """
+        if log_format(filename)[1]:
+            self.load_log(filename)
+            return
+        self.close_viewer()
+        log = self._viewer_log = self.terminal
+        # the indexer must not wait for the UI thread: close() waits for the indexer
+        loop = asyncio.get_running_loop()
+        self._viewer = MappedLog(filename, on_progress=lambda: loop.call_soon_threadsafe(log.records_changed))
+        log.view(self._viewer)
+        self.__show_viewer_state()
+    def close_viewer(self):
+        if self._viewer:
+            self._viewer.close()
+            self._viewer = None
+            self._viewer_log.view(None)
+            self._viewer_log = None
+            self.__show_viewer_state()
+    def __show_viewer_state(self):
+        # the search bar works on the scrollback, not on a log in the viewer
+        viewing = self._viewer_log is self.terminal
+        self.query_one('#search_bar').disabled = viewing
+        self.query_one('#close', Button).label = 'Close Log' if viewing else 'Close'
+    def load_log(self, filename: str):
+        """ replaces the lines in the active channel by the records in a saved log (see read_records) """
+        if self.channel.running:
+            return
+        self.clear()
+        self.__load(filename, self.terminal)
+    @work(thread=True, exclusive=True, group='load_log')
+    def __load(self, filename: str, log: TerminalLog):
+        try:
+            batch = []
+            for record in read_records(filename):
+                batch.append(record)
+                if len(batch) >= self.LOAD_BATCH:
+                    self.app.call_from_thread(self.__load_batch, log, batch)
+                    batch = []
+            self.app.call_from_thread(self.__load_batch, log, batch)
+        except (OSError, ValueError, KeyError) as E:
+            self.app.call_from_thread(log.write, f'can not load {filename}: {E}', TerminalWrite.Level.ERROR)
+    def __load_batch(self, log: TerminalLog, records: list[tuple[float, TerminalWrite.Level, str]]):
+        for timestamp, level, text in records:
+            log.write(text, level, timestamp)
+    def on_button_pressed(self, message: Button.Pressed):
+        match message.button.id:
+            case 'save_log': ask_save_filename(self, self.save_log, title='Save to file', default_extension='.log', filetypes=self.LOG_FILETYPES)
+            case 'open_log': ask_open_filename(self, self.open_log, title='Open log', filetypes=self.LOG_FILETYPES)
+            case 'cancel': self.cancel()
+            case 'close': self.close()
+            case 'next_error': self.next_error()
+        message.stop()
+    def action_search(self):
+        self.query_one('#search', Input).focus()
+    def action_next_error(self):
+        self.next_error()
+    def next_error(self)->bool:
+        """ highlights the next error (in the filtered view) after the highlighted or first visible line, wraps around to the first one.
+            Does nothing while a saved log is shown: the errors are looked up in the scrollback.
+        """
+        log = self.terminal
+        if not log.viewing_scrollback:
+            return False
+        after = log.highlight if log.highlight is not None else log.top_record - 1
+        for start in [after, -1]:
+            number = start
+            while (number := self.scrollback.next_flagged(TerminalWrite.Level.ERROR, number)) is not None:
+                if log.log_filter is None or number in log.log_filter:
+                    log.show_record(number)
+                    return True
+        return False
+    def on_input_changed(self, message: Input.Changed):
+        if message.input.id == 'search':
+            self.__filter_changed()
+    def on_select_changed(self, message: Select.Changed):
+        self.__filter_changed()
+    def on_checkbox_changed(self, message: Checkbox.Changed):
+        self.__filter_changed()
+    def __filter_changed(self):
+        # rebuilding the index scans the complete scrollback, so wait until the user stops typing
+        if self._filter_timer:
+            self._filter_timer.stop()
+        self._filter_timer = self.set_timer(self.FILTER_DELAY, self.apply_filter)
+    def apply_filter(self):
+        search = self.query_one('#search', Input)
+        level = self.query_one('#level', Select).value
+        level = None if level == Select.NULL else level
+        if not search.value and level is None:
+            self.terminal.set_filter(None)
+            return
+        try:
+            log_filter = LogFilter(self.scrollback, level, search.value, regex=self.query_one('#regex', Checkbox).value)
+        except re.error:
+            search.set_class(True, '-invalid')
+            return
+        search.set_class(False, '-invalid')
+        self.terminal.set_filter(log_filter)
+    def flush(self):
+        with self.app.batch_update():
+            for channel in list(self.channels.values()):
+                # a new tab may not be mounted yet, its lines wait in the buffer
+                if channel.log.is_mounted:
+                    self.__flush_channel(channel)
+    def __flush_channel(self, channel: TerminalChannel):
+        lines, first_put = channel.drain()
+        if not lines:
+            return
+        for line, write_class, no_newline in lines:
+            self._write_class(line, write_class, no_newline, channel.log)
+        if first_put is not None:
+            self.call_after_refresh(self.__rendered, channel, first_put)
+    def update_progress(self):
+        """ shows the last progress of the tasks of every channel """
+        for channel in list(self.channels.values()):
+            if channel.progress_panel.is_mounted and (tasks := channel.take_progress()) is not None:
+                channel.progress_panel.show_tasks(tasks)
+    def __rendered(self, channel: TerminalChannel, first_put: float):
+        channel.latency = time.monotonic() - first_put
+    def _write_class(self, line: str, write_class: TerminalWrite.Level, no_newline=False, log: TerminalLog = None):
+        log = log or self.terminal
+        log.write(str(line), write_class)
+    async def on_terminal_write(self, msg: TerminalWrite):
+        # keep the order with the lines already waiting in the buffer
+        self.queue_write(msg.line, msg.write_class, msg.no_newline)
+
+class Console:
+    """ a TerminalScreen installed in the app as `name`. An app can have several consoles (see init_console and get_console), 
+        and every console can run several scripts at the same time, each in a channel of its own.
+    """
+    def __init__(self, app: App, name='terminal', scrollback: int = TerminalScreen.SCROLLBACK, buffer_size: int = TerminalScreen.BUFFER_SIZE, 
+                 overflow: TerminalBuffer.Overflow = TerminalBuffer.Overflow.BLOCK, status_bar = False):
+        self._app: App = app
+        self._app.install_screen(TerminalScreen(scrollback=scrollback, buffer_size=buffer_size, overflow=overflow, status_bar=status_bar), name=name)
+        self._name = name
+        self._terminal: TerminalScreen = self._app.get_screen(name)
+        self._run_result = None
+        self._active = False
+        _consoles[name] = self
+    def callback_run_terminal(self, result: bool):
+        self._run_result = result
+        self._active = False    
+    async def show(self)->bool:
+        if self._active:
+            return
+        await self._app.push_screen(self._name, self.callback_run_terminal)
+        self._active = True
+        self._run_result = None
+        self._terminal.reset()
+    def stats(self)->ConsoleStats:
+        return self._terminal.stats()
+    def start_log(self, filename: str):
+        self._terminal.start_log(filename)
+    def stop_log(self):
+        self._terminal.stop_log()
+    def save_log(self, filename: str):
+        self._terminal.save_log(filename)
+    def load_log(self, filename: str):
+        self._terminal.load_log(filename)
+    def open_log(self, filename: str):
+        self._terminal.open_log(filename)
+    def print(self, msg: str):
+        if self._active:
+            self._terminal.queue_write(msg)
+    def warning(self, message: str):
+        if self._active:
+            self._terminal.queue_write(message, TerminalWrite.Level.WARNING)
+    def error(self, message: str):
+        if self._active:
+            self._terminal.queue_write(message, TerminalWrite.Level.ERROR)
+    def progress(self, task_id: str, fraction: float = None, message: str = ''):
+        if self._active:
+            self._terminal.main.progress(task_id, fraction, message)
+
+class ProcessConsole:
+    """ stands in for the Console in a worker process (see console_run with executor='process'): output is sent to the parent through a queue """
+    def __init__(self, queue: multiprocessing.Queue):
+        self._queue = queue
+        self._progress_sent: dict[str, float] = {}
+        self._progress_pending: dict[str, tuple[float, str]] = {}
+        self._progress_timer: Timer = None
+        self._progress_lock = Lock()
+    def print(self, msg: str):
+        self._queue.put(('write', msg, TerminalWrite.Level.NORMAL))
+    def warning(self, message: str):
+        self._queue.put(('write', message, TerminalWrite.Level.WARNING))
+    def error(self, message: str):
+        self._queue.put(('write', message, TerminalWrite.Level.ERROR))
+    def progress(self, task_id: str, fraction: float = None, message: str = ''):
+        # the screen shows progress at most every PROGRESS_INTERVAL seconds, more updates are not worth sending:
+        # the last update of a task within the interval is kept and sent when the interval is over
+        with self._progress_lock:
+            wait = self._progress_sent.get(task_id, 0.0) + TerminalScreen.PROGRESS_INTERVAL - time.monotonic()
+            if (fraction is not None and fraction >= 1) or wait <= 0:
+                self._progress_pending.pop(task_id, None)
+                self.__send_progress(task_id, fraction, message)
+            else:
+                self._progress_pending[task_id] = fraction, message
+                if self._progress_timer is None:
+                    self._progress_timer = Timer(wait, self.__send_pending)
+                    self._progress_timer.daemon = True
+                    self._progress_timer.start()
+    def __send_progress(self, task_id: str, fraction: float, message: str):
+        self._progress_sent[task_id] = time.monotonic()
+        self._queue.put(('progress', task_id, fraction, message))
+    def __send_pending(self):
+        with self._progress_lock:
+            self._progress_timer = None
+            for task_id, (fraction, message) in self._progress_pending.items():
+                self.__send_progress(task_id, fraction, message)
+            self._progress_pending.clear()
+
+_consoles: dict[str, Console] = {}
+_global_console: Console | ProcessConsole = None
+async def init_console(app: App, name='terminal', **kwdargs)->Console:
+    """ the console `name` of the app (created with kwdargs if it does not exist yet), the first console is the default console """
+    global _global_console
+    if (console := _consoles.get(name)) is None or console._app is not app:
+        console = Console(app, name, **kwdargs)
+    if _global_console is None:
+        _global_console = console
+    return console
+def get_console(name: str = None)->Console:
+    """ the console `name`, the default console if name is None """
+    return _consoles.get(name) if name is not None else _global_console
+def _output(console: str = None)->TerminalChannel | Console | ProcessConsole:
+    # the channel of the calling run, unless another console is asked for
+    if console is None and (channel := _current_channel.get()) is not None:
+        return channel
+    return get_console(console)
+
+def console_print(msg: str, console: str = None):
+    if (output := _output(console)):
+        output.print(msg)
+
+def console_warning(msg: str, console: str = None):
+    if (output := _output(console)):
+        output.warning(msg)
+
+def console_error(msg: str, console: str = None):
+    if (output := _output(console)):
+        output.error(msg)
+
+def console_progress(task_id: str, fraction: float = None, message: str = '', console: str = None):
+    """ shows the progress of a task on one line below the output of the run, updated in place: 
+        a bar for fraction (0..1), or only the message if fraction is None. Any number of tasks can be in progress at the same time.
+        Calls are cheap, only the last value is shown (at most every TerminalScreen.PROGRESS_INTERVAL seconds).
+        A fraction of 1 (or more) finishes the task: its progress line is replaced by one line with the message in the output.
+    """
+    if (output := _output(console)):
+        output.progress(task_id, fraction, message)
+
+class ConsoleHandler(logging.Handler):
+    """ logging.Handler that writes log records to the console: ERROR and up as errors, WARNING as warnings, the rest as normal lines.
+        emit() only puts the record in a queue, a background thread formats it and hands it to the console, 
+        so logging never waits for the UI. 
+        With `rate` (records per second, bursts of up to `burst` records) the records of every logger are limited separately; 
+        the number of suppressed records is reported once the logger is allowed to write again, 
+        or after REPORT_INTERVAL seconds without records and on flush and close.
+    """
+    REPORT_INTERVAL = 1.0
+    def __init__(self, level = logging.NOTSET, rate: float = None, burst: int = None):
+        super().__init__(level)
+        self.rate = rate
+        self.burst = burst or max(1, int(rate or 1))
+        self.dropped = 0
+        self._buckets: dict[str, list] = {} # logger name: [tokens, last update, suppressed, channel of the last suppressed record]
+        # not the handler lock: logging.shutdown holds that while it waits for flush
+        self._buckets_lock = Lock()
+        self._queue = SimpleQueue()
+        self._thread = Thread(target=self.__run, name='ConsoleHandler', daemon=True)
+        self._thread.start()
+    def emit(self, record: logging.LogRecord):
+        # called with the handler lock held (see logging.Handler.handle); 
+        # the channel of the run that logs is passed along, the records are written on another thread
+        if self.rate is not None and not self.__allow(record.name):
+            return
+        self._queue.put((record, _current_channel.get()))
+    def __allow(self, name: str)->bool:
+        now = time.monotonic()
+        with self._buckets_lock:
+            if (bucket := self._buckets.get(name)) is None:
+                bucket = self._buckets[name] = [float(self.burst), now, 0, None]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                bucket[3] = _current_channel.get()
+                self.dropped += 1
+                return False
+            bucket[0] -= 1
+            if bucket[2]:
+                self._queue.put((self.__suppressed(name, bucket[2]), bucket[3]))
+                bucket[2] = 0
+        return True
+    def __suppressed(self, name: str, count: int)->str:
+        return f'{count} log records from {name} suppressed (more than {self.rate:g}/s)'
+    def __report_suppressed(self):
+        with self._buckets_lock:
+            reports = [(self.__suppressed(name, bucket[2]), bucket[3]) for name, bucket in self._buckets.items() if bucket[2]]
+            for bucket in self._buckets.values():
+                bucket[2] = 0
+        for report in reports:
+            self.__write_item(report)
+    def flush(self):
+        # logging.shutdown also flushes handlers that were closed before
+        if self._thread.is_alive():
+            flushed = Event()
+            self._queue.put(flushed)
+            flushed.wait()
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        super().close()
+    def __run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.REPORT_INTERVAL)
+            except Empty:
+                self.__report_suppressed()
+                continue
+            if item is None or isinstance(item, Event):
+                self.__report_suppressed()
+                if item is None:
+                    break
+                item.set()
+                continue
+            self.__write_item(item)
+    def __write_item(self, item: tuple[logging.LogRecord | str, TerminalChannel]):
+        record, channel = item
+        context = _current_channel.set(channel)
+        try:
+            self.__write(record)
+        finally:
+            _current_channel.reset(context)
+    def __write(self, record: logging.LogRecord | str):
+        if isinstance(record, str):
+            console_warning(record)
+            return
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        if record.levelno >= logging.ERROR:
+            console_error(message)
+        elif record.levelno >= logging.WARNING:
+            console_warning(message)
+        else:
+            console_print(message)
+
+_resource_tracker_started = False
+def _ensure_resource_tracker():
+    # multiprocessing passes sys.stderr to the resource tracker process it starts, 
+    # but textual has replaced sys.stderr with a capture that has no valid fileno.
+    # Called once, from the UI thread: nothing else writes to stderr while it is swapped
+    global _resource_tracker_started
+    if _resource_tracker_started:
+        return
+    from multiprocessing import resource_tracker
+    stderr, sys.stderr = sys.stderr, sys.__stderr__
+    try:
+        resource_tracker.ensure_running()
+    finally:
+        sys.stderr = stderr
+    _resource_tracker_started = True
+
+def _process_main(queue: multiprocessing.Queue, cancel_event: Event, script: RunScript, kwdargs: dict):
+    global _global_console
+    _global_console = ProcessConsole(queue)
+    # the worker shares the terminal with the textual app, output should only go through the console
+    sys.stdout = sys.stderr = open(os.devnull, 'w')
+    try:
+        queue.put(('result', script(cancel_token=CancelToken(cancel_event), **kwdargs)))
+    except BaseException:
+        queue.put(('exception', traceback.format_exc()))
+
+async def console_run(script, log_file: str = None, timeout: float = None, executor: str = 'thread', channel: str = None, console: str = None, 
+                      **kwdargs)->Worker:
+    """ runs the script in a channel (tab) of its own in the console (default: the default console), named `channel` (default: the name of the script).
+        Several scripts can run at the same time, console_print in a script writes to the channel of its run.
+        executor='process' runs the script in a worker process, so CPU-bound scripts do not hold the GIL of the UI. 
+        The script and its arguments must then be picklable (e.g. a module-level function).
+    """
+    if (target := get_console(console)):
+        return target._terminal.run(script, log_file=log_file, timeout=timeout, executor=executor, channel=channel, **kwdargs)
+
+async def console_run_command(argv: Iterable[str], log_file: str = None, timeout: float = None, 
+                              stderr_class: TerminalWrite.Level = TerminalWrite.Level.WARNING, channel: str = None, console: str = None, **kwdargs)->Worker:
+    """ runs argv as a subprocess on the event loop, stdout and stderr are streamed to a channel of its own line by line.
+        kwdargs are passed to asyncio.create_subprocess_exec (e.g. cwd, env).
+    """
+    if (target := get_console(console)):
+        return target._terminal.run_command(argv, log_file=log_file, timeout=timeout, stderr_class=stderr_class, channel=channel, **kwdargs)
+    
+async def show_console(console: str = None)->bool:
+    if (target := get_console(console)):
+        await target.show()
+        return True
+    return False
+
+if __name__=="__main__":
+    from textual.widgets import Header, Footer
+    from textual.app import App
+
+    def testscript(cancel_token: CancelToken, **kwdargs)->bool:
+        console_print(f'params {kwdargs}')
+        logger = logging.getLogger('testscript')
+        N = kwdargs.pop('N')
+        for i in range(1,N):
+            if cancel_token.cancelled:
+                return False
+            if i % 100 == 0:
+                logger.info(f'logging {i} (at most 5/s)')
+            if i % 1600 == 0:
+                console_warning(f'nu is i = {i}\n maar niet heus...')
+            if i % 2000 == 0:
+                console_error(f'nu is i = {i}'.upper())
+            console_progress('testscript', i / N, f'{i} van {N}')
+            if i % 10 == 0:
+                console_progress('even', (i % 5000) / 5000, f'ronde {i // 5000 + 1}')
+        console_progress('testscript', 1.0, f'{N} regels verwerkt')
+        return False
+
+    class TestApp(App):
+        BINDINGS= [('r', 'run', 'Run terminal'), ('p', 'run_parallel', 'Run three at once')]
+
+        def compose(self) -> ComposeResult:
+            yield Header()
+            yield Footer()
+        async def on_mount(self):
+            await init_console(self)
+        async def action_run(self):
+            if await show_console():
+                console_print(f'INITIALIZE RUN {datetime.datetime.strftime(datetime.datetime.now(), "%d-%m-%Y, %H:%M:%S")}')
+                await console_run(testscript, N=95000)
+        async def action_run_parallel(self):
+            if await show_console():
+                for n in range(1, 4):
+                    await console_run(testscript, channel=f'job {n}', N=30000 * n)
+
+if __name__ == "__main__":
+    logging.basicConfig(filename='terminal.log', filemode='w', format='%(module)s-%(funcName)s-%(lineno)d: %(message)s', level=logging.DEBUG)
+    logging.getLogger('testscript').addHandler(ConsoleHandler(logging.INFO, rate=5))
+    app = TestApp()
+    app.run()
@@ -0,0 +1,158 @@
+from textual import events
+from textual.app import App, ComposeResult
+from textual.reactive import reactive
+from textual.timer import Timer
+from textual.widgets import Header, Footer, Static,  Button, Input
+from textual.validation import Number
+from textual.containers import ScrollableContainer
+
+class UpdownWidget(Static):
+    DEFAULT_CSS = """
+        UpdownWidget {
+            width: 9;
+            margin: 1;
+            content-align: right middle;
+        }
+        Updown Input {
+            width: 8;
+            padding: 0 1;
+            margin-left: 0;
+            height: 1;
+            text-align: center; /* doesnt work */
+        }
+        Updown Button {
+            width: 7;
+            min-width: 7;
+            height: 1;
+            border: none;
+        }    
+
+"""
+    REPEAT_DELAY = 0.4
+    REPEAT_INTERVAL = 1/20 # while a button is held, the value (and the input) changes at most 20 times per second
+    ACCELERATE_AFTER = 10  # the step doubles every ACCELERATE_AFTER repeats
+    value: reactive[int] = reactive(1, init=False)
+    def __init__(self, value: int = None, minimum: int = 1, maximum: int = 999, step: int = 1, **kwdargs):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.step = step
+        self._disabled = False
+        self._visible = True
+        self._plus: Button = None
+        self._minus: Button = None
+        self._input: Input = None
+        self._repeat_timer: Timer = None
+        self._repeat_direction = 0
+        self._repeats = 0
+        self._repeated = False
+        super().__init__(**kwdargs)
+        self.set_reactive(UpdownWidget.value, self.validate_value(minimum if value is None else value))
+    def _get_name(self, what: str)->str:
+        return f'{self.name}-{what}-'
+    def compose(self) -> ComposeResult:
+        self._plus = Button("+", id = 'plus', name=self._get_name('PLUS'), variant = 'default')
+        self._input = Input(str(self.value), id='input', name=self._get_name('INPUT'), validators=Number(minimum=self.minimum, maximum=self.maximum))
+        self._minus = Button("-", id = 'minus', name=self._get_name('MINUS'),variant = 'default')
+        yield self._plus
+        yield self._input
+        yield self._minus
+    @property
+    def disabled(self)->bool:
+        return self._disabled
+    @disabled.setter
+    def disabled(self, value: bool):
+        self._disabled = value
+        for node in self.query():
+            node.disabled = value
+        self.__enable_buttons()
+    @property
+    def visible(self)->bool:
+        return self._visible
+    @visible.setter
+    def visible(self, value: bool):
+        self._visible = value
+        for node in self.query():
+            node.visible = value
+    @property
+    def _input_widget(self)->Input:
+        return self._input
+    @property
+    def input_value(self)->int:
+        return self.value
+    @input_value.setter
+    def input_value(self, value: int):
+        self.value = value
+    def validate_value(self, value: int)->int:
+        return min(self.maximum, max(self.minimum, int(value)))
+    def watch_value(self, value: int):
+        if self._input and self._input.value != str(value):
+            self._input.value = str(value)
+        self.__enable_buttons()
+    def __enable_buttons(self):
+        if self._minus:
+            self._minus.disabled = self._disabled or self.value <= self.minimum
+            self._plus.disabled = self._disabled or self.value >= self.maximum
+    def on_mount(self)->None:
+        self.__enable_buttons()
+        self._input.focus()  
+    def on_input_changed(self, event: Input.Changed):
+        try:
+            value = int(event.value)
+        except ValueError:
+            return
+        if self.minimum <= value <= self.maximum:
+            self.value = value
+    def __step(self, direction: int, count: int = 1):
+        self.value = self.value + direction * count * self.step
+    def __direction(self, widget)->int:
+        return 1 if widget is self._plus else -1 if widget is self._minus else 0
+    def on_mouse_down(self, event: events.MouseDown):
+        if (direction := self.__direction(event.widget)) and not event.widget.disabled:
+            self.__stop_repeat()
+            self._repeated = False
+            self._repeat_direction = direction
+            self._repeats = 0
+            self._repeat_timer = self.set_timer(self.REPEAT_DELAY, self.__start_repeat)
+    def __start_repeat(self):
+        self._repeat_timer = self.set_interval(self.REPEAT_INTERVAL, self.__repeat)
+    def __repeat(self):
+        self._repeated = True
+        self._repeats += 1
+        self.__step(self._repeat_direction, 2 ** min(self._repeats // self.ACCELERATE_AFTER, 16))
+        if self.value in (self.minimum, self.maximum):
+            # the button is disabled now, so there will be no click to end the repeat
+            self.__stop_repeat()
+            self._repeated = False
+    def on_mouse_up(self, event: events.MouseUp):
+        self.__stop_repeat()
+    def on_leave(self, event: events.Leave):
+        if self.__direction(event.node) and self._repeat_timer:
+            self.__stop_repeat()
+            self._repeated = False
+    def __stop_repeat(self):
+        if self._repeat_timer:
+            self._repeat_timer.stop()
+            self._repeat_timer = None
+    def on_button_pressed(self, event: Button.Pressed)->None:
+        if self._repeated:
+            # the click that ends a repeat
+            self._repeated = False
+        elif (direction := self.__direction(event.button)):
+            self.__step(direction)
+        event.stop()
+
+if __name__ == "__main__":
+    class TestApp(App):
+        BINDINGS = [("d", "toggle_dark", "Toggle dark mode")]
+        
+        def compose(self) -> ComposeResult:
+            yield Header()
+            yield Footer()
+            yield ScrollableContainer(UpdownWidget(), UpdownWidget(value=100, minimum=0, maximum=100000, step=5))
+
+        def action_toggle_dark(self) -> None:
+            """An action to toggle dark mode."""
+            self.dark = not self.dark
+
+    app = TestApp()
+    app.run()
\ No newline at end of file
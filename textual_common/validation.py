@@ -0,0 +1,98 @@
+import asyncio
+import os
+from typing import Iterable
+
+from textual.cache import LRUCache
+from textual.timer import Timer
+from textual.validation import ValidationResult, Validator
+from textual.widgets import Input
+
+class AsyncValidator(Validator):
+    """ validator that has to wait (e.g. for I/O): implement validate_async. Can only be used in a Validation. """
+    async def validate_async(self, value: str)->ValidationResult:
+        raise NotImplementedError
+    def validate(self, value: str)->ValidationResult:
+        raise NotImplementedError(f'{type(self).__name__} is an AsyncValidator, use it in a Validation')
+
+class PathExists(Validator):
+    """ the value is an existing file or directory; best run on a thread (Validation(..., thread=True)) """
+    def validate(self, value: str)->ValidationResult:
+        return self.success() if os.path.exists(value) else self.failure(f'{value} does not exist')
+
+class Validation:
+    """ validators for an input that are not run on every keystroke:
+        the input is validated `debounce` seconds after the last change, and results are memoized per value (cache_size values).
+        With thread=True the (synchronous) validators run on a worker thread, AsyncValidators are awaited.
+    """
+    def __init__(self, validators: Validator | Iterable[Validator], debounce: float = 0.3, thread = False, cache_size = 256):
+        self.validators = [validators] if isinstance(validators, Validator) else list(validators)
+        self.debounce = debounce
+        self.thread = thread
+        self._cache = LRUCache(cache_size) if cache_size else None
+    def cached(self, value: str)->ValidationResult:
+        return self._cache.get(value) if self._cache is not None else None
+    async def validate(self, value: str)->ValidationResult:
+        if (result := self.cached(value)) is not None:
+            return result
+        sync_validators = [validator for validator in self.validators if not isinstance(validator, AsyncValidator)]
+        waiting = [validator.validate_async(value) for validator in self.validators if isinstance(validator, AsyncValidator)]
+        if self.thread:
+            waiting.append(asyncio.to_thread(self.__validate, sync_validators, value))
+            results = []
+        else:
+            results = [self.__validate(sync_validators, value)]
+        results.extend(await asyncio.gather(*waiting))
+        result = ValidationResult.merge(results)
+        if self._cache is not None:
+            self._cache[value] = result
+        return result
+    @staticmethod
+    def __validate(validators: list[Validator], value: str)->ValidationResult:
+        return ValidationResult.merge([validator.validate(value) for validator in validators])
+
+async def validate_value(validators: Validation | Validator | Iterable[Validator], value: str)->ValidationResult:
+    """ validates a value that is not in an input (e.g. a field of a Form that is not mounted) """
+    if validators is None:
+        return None
+    if isinstance(validators, Validation):
+        return await validators.validate(value)
+    return ValidationResult.merge([validator.validate(value) for validator in ([validators] if isinstance(validators, Validator) else validators)])
+
+class ValidatedInput(Input):
+    """ Input validated through a Validation: a memoized result is shown at once,
+        otherwise the validation runs in a worker once the value has not changed for `debounce` seconds
+    """
+    def __init__(self, value: str = None, validation: Validation = None, **kwdargs):
+        self.validation = validation
+        self.validation_result: ValidationResult = None
+        self._timer: Timer = None
+        super().__init__(value, **kwdargs)
+    def validate(self, value: str)->ValidationResult:
+        if self.valid_empty and not value:
+            return self.__show(ValidationResult.success())
+        if (result := self.validation.cached(value)) is not None:
+            return self.__show(result)
+        if self._timer:
+            self._timer.stop()
+        if self.is_mounted:
+            self._timer = self.set_timer(self.validation.debounce, lambda: self.run_worker(self.validate_now(), exclusive=True, group='validate'))
+        return None
+    async def validate_now(self)->ValidationResult:
+        """ validates the current value without waiting, the input shows the result """
+        value = self.value
+        result = await self.validation.validate(value)
+        if value == self.value:
+            self.__show(result)
+        return result
+    def __show(self, result: ValidationResult)->ValidationResult:
+        self.validation_result = result
+        self._valid = result.is_valid
+        self.set_class(not self._valid, '-invalid')
+        self.set_class(self._valid, '-valid')
+        return result
+
+def validated_input(value: str, validators: Validation | Validator | Iterable[Validator], **kwdargs)->Input:
+    """ a ValidatedInput if validators is a Validation, a plain Input (validated on every change) otherwise """
+    if isinstance(validators, Validation):
+        return ValidatedInput(value, validation=validators, **kwdargs)
+    return Input(value, validators=validators, **kwdargs)